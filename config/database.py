@@ -5,8 +5,9 @@ Location: config/database.py
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from config.settings import settings
 from src.database.models import Base
 
@@ -14,13 +15,20 @@ from src.database.models import Base
 def get_engine():
     """Create and return database engine."""
     
-    # For SQLite, use StaticPool to avoid threading issues
     if settings.DATABASE_URL.startswith('sqlite'):
+        # An in-memory database lives in its single connection, so it has to
+        # be shared (StaticPool). A file database gets a fresh connection per
+        # session instead: handlers run sessions in worker threads, and on a
+        # shared sqlite3 connection one session's commit or rollback would
+        # also apply to another's open transaction.
+        database = make_url(settings.DATABASE_URL).database
+        in_memory = database in (None, '', ':memory:') or 'mode=memory' in settings.DATABASE_URL
+        
         engine = create_engine(
             settings.DATABASE_URL,
             echo=settings.DEBUG,
             connect_args={'check_same_thread': False},
-            poolclass=StaticPool
+            poolclass=StaticPool if in_memory else NullPool
         )
     else:
         # For other databases (PostgreSQL, MySQL, etc.)
@@ -28,8 +36,8 @@ def get_engine():
             settings.DATABASE_URL,
             echo=settings.DEBUG,
             pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW
         )
     
     return engine
@@ -114,6 +114,7 @@ class Settings(BaseSettings):
     SENTIMENT_THRESHOLD_BULLISH: float = 0.6
     SENTIMENT_THRESHOLD_BEARISH: float = -0.6
     SENTIMENT_WEIGHT: float = 0.3
+    SENTIMENT_FAST_PATH: bool = True  # Skip TextBlob when VADER and keywords agree
     
     # News Scraping
     NEWS_API_KEY: str = Field(default="", env="NEWS_API_KEY")
@@ -152,6 +153,8 @@ class Settings(BaseSettings):
         default="sqlite:///./data/trading_bot.db",
         env="DATABASE_URL"
     )
+    DATABASE_POOL_SIZE: int = 25  # Pooled connections (non-SQLite) for concurrent bot updates
+    DATABASE_MAX_OVERFLOW: int = 25
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
@@ -25,13 +25,19 @@ from config.settings import settings, validate_settings
 from src.database.models import Base, User, UserRole
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application
+
+try:
+    import aiolimiter  # noqa: F401  (backs AIORateLimiter)
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
 
 # Import handlers
 from src.utils.logger import get_logger
 from src.telegram_bot.handlers.user_commands import register_user_handlers
 from src.telegram_bot.handlers.admin_commands import register_admin_handlers
-from src.telegram_bot.handlers.account_commands import register_account_handlers
+from src.telegram_bot.handlers.account_commands import MT5_EXECUTOR, register_account_handlers
 from src.telegram_bot.handlers.trade_commands import register_trade_handlers
 from src.telegram_bot.handlers.button_handlers import register_button_handlers
 from src.telegram_bot.handlers.missing_commands import register_missing_handlers
@@ -50,6 +56,7 @@ class ProductionTradingBot:
         self.db_session = None
         self.message_queue = get_message_queue()
         self.mt5_connector = None
+        self.admin_handler = None
         self.shutdown_event = asyncio.Event()
         
         self.logger.info("="*70)
@@ -143,8 +150,8 @@ class ProductionTradingBot:
                     settings.DATABASE_URL,
                     echo=settings.DEBUG,
                     pool_pre_ping=True,
-                    pool_size=10,
-                    max_overflow=20
+                    pool_size=settings.DATABASE_POOL_SIZE,
+                    max_overflow=settings.DATABASE_MAX_OVERFLOW
                 )
             )
             
@@ -186,13 +193,17 @@ class ProductionTradingBot:
                 self.logger.warning("Telegram disabled")
                 return True
             
-            self.telegram_app = Application.builder().token(
-                settings.TELEGRAM_BOT_TOKEN
-            ).build()
+            # Updates from different chats are handled concurrently
+            builder = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).concurrent_updates(True)
+            if AIOLIMITER_AVAILABLE:
+                # Pace outgoing calls to Telegram's flood limits instead of
+                # failing with RetryAfter under load
+                builder = builder.rate_limiter(AIORateLimiter(max_retries=2))
+            self.telegram_app = builder.build()
             
             # Register handlers
             register_user_handlers(self.telegram_app, self.db_session)
-            register_admin_handlers(self.telegram_app, self.db_session)
+            self.admin_handler = register_admin_handlers(self.telegram_app, self.db_session)
             register_account_handlers(self.telegram_app, self.db_session)
             register_trade_handlers(self.telegram_app, self.db_session)
             register_button_handlers(self.telegram_app, self.db_session)
@@ -281,9 +292,15 @@ class ProductionTradingBot:
             try:
                 await asyncio.sleep(60)
                 
-                if self.mt5_connector and not self.mt5_connector.check_connection():
+                if not self.mt5_connector:
+                    continue
+                
+                # Same single thread as the handlers' MT5 calls: the terminal
+                # session is global, so checks must not overlap account tests
+                loop = asyncio.get_running_loop()
+                if not await loop.run_in_executor(MT5_EXECUTOR, self.mt5_connector.check_connection):
                     self.logger.warning("MT5 connection lost, reconnecting...")
-                    if self.mt5_connector.connect():
+                    if await loop.run_in_executor(MT5_EXECUTOR, self.mt5_connector.connect):
                         self.logger.info("MT5 reconnected")
                 
             except Exception as e:
@@ -319,6 +336,10 @@ class ProductionTradingBot:
         
         await asyncio.sleep(2)
         
+        if self.admin_handler:
+            # Flush buffered audit rows before the session goes away
+            await self.admin_handler.close()
+        
         if self.db_session:
             self.db_session.close()
         
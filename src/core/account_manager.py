@@ -8,7 +8,7 @@ from src.database.models import MT5Account, User, AccountStatus
 from src.security.encryption import get_encryptor
 from src.data.mt5_connector import MT5Connector
 from src.utils.logger import get_logger
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 from datetime import datetime
 
 logger = get_logger("AccountManager")
@@ -29,10 +29,16 @@ class AccountManager:
         user_id: int,
         account_name: str,
         mt5_login: int,
-        mt5_password: str,
-        mt5_server: str
+        mt5_password: Optional[str],
+        mt5_server: str,
+        encrypted_password: Optional[str] = None
     ) -> Optional[MT5Account]:
-        """Add new MT5 account for user."""
+        """
+        Add new MT5 account for user.
+        
+        Pass either the plaintext mt5_password or an encrypted_password
+        already produced by the shared encryptor.
+        """
         try:
             # Check user account limit
             user = self.db.query(User).filter_by(id=user_id).first()
@@ -49,7 +55,8 @@ class AccountManager:
                 raise ValueError("Maximum 5 accounts allowed for non-admin users")
             
             # Encrypt password
-            encrypted_password = self.encryptor.encrypt(mt5_password)
+            if encrypted_password is None:
+                encrypted_password = self.encryptor.encrypt(mt5_password)
             
             # Create account record
             account = MT5Account(
@@ -65,7 +72,7 @@ class AccountManager:
             self.db.commit()
             
             # Test connection
-            if self.test_connection(account.id):
+            if self.test_connection(account.id) is not None:
                 account.status = AccountStatus.ACTIVE
                 self.db.commit()
                 self.logger.info(f"Account {mt5_login} added successfully for user {user_id}")
@@ -81,12 +88,18 @@ class AccountManager:
             self.db.rollback()
             return None
     
-    def test_connection(self, account_id: int) -> bool:
-        """Test MT5 connection for an account."""
+    def test_connection(self, account_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Test MT5 connection for an account.
+        
+        Returns:
+            The account fields refreshed from the terminal (empty if it
+            reported no account info), or None if the connection failed
+        """
         try:
             account = self.db.query(MT5Account).filter_by(id=account_id).first()
             if not account:
-                return False
+                return None
             
             # Decrypt password
             password = self.encryptor.decrypt(account.encrypted_password)
@@ -103,22 +116,27 @@ class AccountManager:
             if connector.connect():
                 # Get account info to update currency and balance
                 info = connector.get_account_info()
+                updated = {}
                 if info:
-                    account.account_currency = info['currency']
-                    account.account_balance = info['balance']
-                    account.account_equity = info['equity']
-                    account.account_leverage = info['leverage']
-                    account.last_connected = datetime.utcnow()
+                    updated = {
+                        'account_currency': info['currency'],
+                        'account_balance': info['balance'],
+                        'account_equity': info['equity'],
+                        'account_leverage': info['leverage'],
+                        'last_connected': datetime.utcnow(),
+                    }
+                    for field, value in updated.items():
+                        setattr(account, field, value)
                     self.db.commit()
                 
                 connector.disconnect()
-                return True
+                return updated
             
-            return False
+            return None
         
         except Exception as e:
             self.logger.exception(f"Connection test failed: {e}")
-            return False
+            return None
     
     def get_connector(self, account_id: int) -> Optional[MT5Connector]:
         """Get or create MT5 connector for account."""
@@ -172,7 +190,7 @@ class AccountManager:
                 return False
             
             # Test connection first
-            if not self.test_connection(account_id):
+            if self.test_connection(account_id) is None:
                 return False
             
             account.auto_trade_enabled = True
@@ -5,7 +5,7 @@ Production-Ready Schema
 Author: BLESSING OMOREGIE
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -32,6 +32,12 @@ class AccountStatus(enum.Enum):
 class User(Base):
     """Telegram users with role-based access."""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Admin /stats active/admin/banned buckets read only these columns
+        Index('ix_users_active_role', 'is_active', 'role'),
+        # Keyset pagination for the admin /users listing (newest first)
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     telegram_chat_id = Column(Integer, unique=True, nullable=False, index=True)
@@ -56,6 +62,12 @@ class User(Base):
 class MT5Account(Base):
     """MT5 trading accounts linked to users."""
     __tablename__ = 'mt5_accounts'
+    __table_args__ = (
+        # Per-user active-account lookups filter on both columns
+        Index('ix_mt5_accounts_user_status', 'user_id', 'status'),
+        # Admin /stats status and auto-trade buckets
+        Index('ix_mt5_accounts_status_auto_trade', 'status', 'auto_trade_enabled'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
@@ -87,6 +99,10 @@ class MT5Account(Base):
 class Trade(Base):
     """Trade execution history."""
     __tablename__ = 'trades'
+    __table_args__ = (
+        # Covers the open/closed, win/loss and total P&L aggregates in /stats
+        Index('ix_trades_closed_profit', 'is_closed', 'profit'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), index=True)
@@ -185,6 +201,10 @@ class BotConfiguration(Base):
 class AuditLog(Base):
     """Audit log for security and compliance."""
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        # Per-user audit history, newest first
+        Index('ix_audit_logs_user_timestamp', 'user_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), index=True)
@@ -9,13 +9,21 @@ Repository: nyx_trial
 Location: src/notifications/notifier.py (REPLACE EXISTING)
 """
 
-import requests
+import asyncio
+import functools
+import hashlib
 import json
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, List, Set
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 try:
     from telegram import Bot, Update
     from telegram.ext import Application, CommandHandler, ContextTypes
@@ -24,7 +32,155 @@ try:
 except ImportError:
     TELEGRAM_AVAILABLE = False
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    
+    def _json_bytes(payload: Dict) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:
+    def _json_bytes(payload: Dict) -> bytes:
+        return json.dumps(payload).encode()
+
+from ..security.rate_limiter import TokenBucketRateLimiter
 from ..utils.logger import get_logger
+from ..utils.symbol_normalizer import SymbolNormalizer
+
+# Telegram allows < 1 message/sec per chat; queued messages are coalesced
+# into one sendMessage body (API hard limit is 4096 chars)
+TELEGRAM_BATCH_LIMIT = 3800
+TELEGRAM_BATCH_SEPARATOR = "\n\n---\n\n"
+TELEGRAM_MIN_INTERVAL = 1.05
+
+# Client-side outbound limiters so we never rely on server 429s. Telegram
+# allows about 1 message/sec per chat and about 30/sec across all chats, so
+# TELEGRAM_OUT_LIMITER is keyed by chat_id and TELEGRAM_GLOBAL_LIMITER
+# bounds the total
+TELEGRAM_OUT_LIMITER = TokenBucketRateLimiter(rate=1.0, capacity=20)
+TELEGRAM_GLOBAL_LIMITER = TokenBucketRateLimiter(rate=30.0, capacity=30)
+DISCORD_OUT_LIMITER = TokenBucketRateLimiter(rate=5.0, capacity=30)
+
+# Identical Discord messages within this window are posted only once
+DISCORD_DEDUP_WINDOW = 10.0
+DISCORD_DEDUP_SIZE = 512
+
+# (epoch second, formatted string) of the last rendered timestamp
+_last_timestamp = (None, "")
+
+
+@functools.lru_cache(maxsize=256)
+def _pip_multiplier(symbol: str) -> float:
+    """Pips per unit of price for symbol (memoized per symbol)."""
+    return 1.0 / SymbolNormalizer.get_pip_value(symbol)
+
+
+def _timestamp() -> str:
+    """Current time for message footers, formatted at most once per second."""
+    global _last_timestamp
+    
+    second = int(time.time())
+    cached_second, cached_text = _last_timestamp
+    
+    if second != cached_second:
+        cached_text = datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S UTC')
+        _last_timestamp = (second, cached_text)
+    
+    return cached_text
+
+
+# Static signal layout, parsed once; filled by _format_signal()
+_SIGNAL_TEMPLATE = """\
+{direction_marker} TRADING SIGNAL {order_marker}
+
+Symbol: {symbol}
+Direction: {direction}
+Scenario: {scenario}
+POI Type: {poi_type}
+
+ORDER TYPE: {order_type}
+Status: {order_status}
+Reason: {order_reason}
+
+CURRENT PRICE: {current:.5f}
+ENTRY PRICE: {entry:.5f}
+
+STOP LOSS: {sl:.5f}
+SL Distance: {sl_pips:.1f} pips
+
+TAKE PROFIT 1: {tp1:.5f}
+TP1 Distance: {tp1_pips:.1f} pips
+R:R TP1: 1:{rr_tp1:.2f}
+
+TAKE PROFIT 2: {tp2:.5f}
+TP2 Distance: {tp2_pips:.1f} pips
+R:R TP2: 1:{rr_tp2:.2f}
+
+ANALYSIS:
+Confidence: {confidence:.1f}%
+ML Prediction: {ml_label} (Conf: {ml_confidence:.1f}%)
+Sentiment: {sentiment_label} ({sentiment_score:.2f})
+
+VALIDATION:
+Inducement Swept: {inducement_swept}
+FVG Validation: {fvg_validation}
+
+Time: {time}
+
+Risk Disclaimer: Use proper risk management. Suggested position size: 1-2% of capital."""
+
+
+def _format_signal(signal: Dict, sl_pips: float, tp1_pips: float, tp2_pips: float) -> str:
+    """Render a trading signal message from precomputed pip distances."""
+    entry = signal['entry_price']
+    
+    # Order status
+    if signal.get('immediate_execution', True):
+        order_status = "EXECUTE NOW"
+        order_marker = "[IMMEDIATE]"
+    else:
+        order_status = "PENDING ORDER"
+        order_marker = "[PENDING]"
+    
+    return _SIGNAL_TEMPLATE.format(
+        direction_marker="[BUY]" if signal['direction'] == "BUY" else "[SELL]",
+        order_marker=order_marker,
+        symbol=signal['symbol'],
+        direction=signal['direction'],
+        scenario=signal.get('scenario', 'N/A'),
+        poi_type=signal.get('poi_type', 'N/A'),
+        order_type=signal.get('order_type', 'Market Order'),
+        order_status=order_status,
+        order_reason=signal.get('order_reason', 'Price at entry level'),
+        current=signal.get('current_price', entry),
+        entry=entry,
+        sl=signal['stop_loss'],
+        sl_pips=sl_pips,
+        tp1=signal['take_profit_1'],
+        tp1_pips=tp1_pips,
+        rr_tp1=signal.get('risk_reward_tp1', 0),
+        tp2=signal['take_profit_2'],
+        tp2_pips=tp2_pips,
+        rr_tp2=signal.get('risk_reward_tp2', 0),
+        confidence=signal['confidence'] * 100,
+        ml_label=signal['ml_prediction']['ensemble'],
+        ml_confidence=signal['ml_prediction']['confidence'] * 100,
+        sentiment_label=signal['sentiment']['label'].upper(),
+        sentiment_score=signal['sentiment']['score'],
+        inducement_swept='Yes' if signal.get('inducement_swept', False) else 'No',
+        fvg_validation='Yes' if signal.get('fvg_validation', False) else 'No',
+        time=_timestamp()
+    )
 
 
 class UserDatabase:
@@ -122,6 +278,10 @@ class MultiUserNotifier:
     """
     Multi-user notification system with Telegram bot support.
     NO EMOJIS - Professional trading notifications only.
+    
+    Public send methods only format the message and enqueue it; a single
+    daemon worker thread owns an asyncio loop and delivers to Telegram and
+    Discord concurrently, so the trading loop never waits on the network.
     """
     
     def __init__(self, config):
@@ -146,6 +306,177 @@ class MultiUserNotifier:
         
         # Discord webhook
         self.discord_webhook = config.DISCORD_WEBHOOK_URL if config.ENABLE_DISCORD else None
+        
+        # Skip all message formatting when no channel can deliver
+        self._any_enabled = bool(self.telegram_bot) or bool(self.discord_webhook)
+        
+        # Shared HTTP client (owned by the dispatch worker's event loop)
+        self._client = None
+        
+        # Content hash -> last post time, touched only by the dispatch worker
+        self._recent_discord = OrderedDict()
+        
+        # Background dispatch queue: (channel, message, title) tuples
+        self._last_telegram_send = 0.0
+        self._queue = queue.Queue(maxsize=1000)
+        self._worker = threading.Thread(
+            target=self._dispatch_loop,
+            name="notifier-dispatch",
+            daemon=True
+        )
+        self._worker.start()
+    
+    def _enqueue(self, channel: str, message: str, title: str = "Notification"):
+        """Queue a message for background delivery, dropping the oldest on overflow."""
+        item = (channel, message, title)
+        
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(item)
+            self.logger.warning("Notification queue full - dropped oldest message")
+    
+    def _dispatch_loop(self):
+        """Worker thread: drain the queue and deliver on a private event loop."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        running = True
+        
+        try:
+            while running:
+                batch = [self._queue.get()]
+                
+                # Batch everything already waiting behind the first item
+                while batch[-1] is not None:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                if batch[-1] is None:
+                    running = False
+                
+                items = [item for item in batch if item is not None]
+                
+                try:
+                    if items:
+                        loop.run_until_complete(self._deliver(items))
+                except Exception as e:
+                    self.logger.error(f"Notification dispatch failed: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            loop.run_until_complete(self._close_client())
+            loop.close()
+    
+    async def _deliver(self, items: List[tuple]):
+        """Deliver a batch of queued messages to their channel(s)."""
+        telegram_messages = [message for _, message, _ in items]
+        discord_messages = [
+            (message, title) for channel, message, title in items
+            if channel == "all"
+        ]
+        
+        await asyncio.gather(
+            self._send_telegram_batches(telegram_messages),
+            *(self._send_discord(message, title) for message, title in discord_messages)
+        )
+    
+    @staticmethod
+    def _coalesce(messages: List[str]) -> List[str]:
+        """Join messages into as few Telegram bodies as fit the size limit."""
+        bodies = []
+        current = []
+        size = 0
+        
+        for message in messages:
+            extra = len(message) + (len(TELEGRAM_BATCH_SEPARATOR) if current else 0)
+            
+            if current and size + extra > TELEGRAM_BATCH_LIMIT:
+                bodies.append(TELEGRAM_BATCH_SEPARATOR.join(current))
+                current = []
+                extra = len(message)
+                size = 0
+            
+            current.append(message)
+            size += extra
+        
+        if current:
+            bodies.append(TELEGRAM_BATCH_SEPARATOR.join(current))
+        
+        return bodies
+    
+    async def _send_telegram_batches(self, messages: List[str]):
+        """Send coalesced Telegram bodies, spaced to respect the per-chat limit."""
+        for body in self._coalesce(messages):
+            wait = TELEGRAM_MIN_INTERVAL - (time.monotonic() - self._last_telegram_send)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            await self._send_to_all_subscribers(body)
+            self._last_telegram_send = time.monotonic()
+    
+    def flush(self):
+        """Block until every queued notification has been delivered."""
+        self._queue.join()
+    
+    def close(self):
+        """Deliver pending notifications and stop the worker thread."""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=30)
+    
+    @staticmethod
+    async def _acquire(limiter: TokenBucketRateLimiter, key: int = 0):
+        """Wait until the outbound limiter grants a token from key's bucket."""
+        while not limiter.is_allowed(key)[0]:
+            await asyncio.sleep(0.05)
+    
+    @staticmethod
+    def _discord_digest(message: str, title: str) -> bytes:
+        """Dedup key for a Discord message."""
+        # Ignore "Time:" footers so repeats a few seconds apart still match
+        content = "\n".join(
+            line for line in message.splitlines() if not line.startswith("Time: ")
+        )
+        return hashlib.blake2b(f"{title}\0{content}".encode(), digest_size=8).digest()
+    
+    def _is_duplicate_discord(self, digest: bytes) -> bool:
+        """Check whether this Discord message was posted within the dedup window."""
+        last_sent = self._recent_discord.get(digest)
+        return last_sent is not None and time.monotonic() - last_sent < DISCORD_DEDUP_WINDOW
+    
+    def _record_discord(self, digest: bytes):
+        """Remember a successfully posted Discord message for deduplication."""
+        self._recent_discord[digest] = time.monotonic()
+        self._recent_discord.move_to_end(digest)
+        if len(self._recent_discord) > DISCORD_DEDUP_SIZE:
+            self._recent_discord.popitem(last=False)
+    
+    async def _get_client(self):
+        """Get or create the shared (HTTP/2 multiplexed) httpx client."""
+        if not HTTPX_AVAILABLE:
+            return None
+        
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+                timeout=10.0
+            )
+        return self._client
+    
+    async def _close_client(self):
+        """Release network resources."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
     
     def _setup_telegram_bot(self):
         """Setup Telegram bot with command handlers."""
@@ -164,9 +495,6 @@ class MultiUserNotifier:
             self.telegram_app.add_handler(CommandHandler("help", self._cmd_help))
             
             # Start bot in background
-            import asyncio
-            import threading
-            
             def run_bot():
                 asyncio.run(self.telegram_app.run_polling())
             
@@ -310,86 +638,50 @@ DISCLAIMER: Trading carries risk. Use proper risk management. Signals are for in
     
     def send_signal_notification(self, signal: Dict):
         """Send trading signal to all subscribers."""
+        if not self._any_enabled:
+            return
         
-        direction_marker = "[BUY]" if signal['direction'] == "BUY" else "[SELL]"
+        entry = signal['entry_price']
+        pip_multiplier = _pip_multiplier(signal['symbol'])
         
         # Calculate pips
-        symbol = signal['symbol']
-        entry = signal['entry_price']
-        current = signal.get('current_price', entry)
-        sl = signal['stop_loss']
-        tp1 = signal['take_profit_1']
-        tp2 = signal['take_profit_2']
-        
-        # Import symbol normalizer
-        from ..utils.symbol_normalizer import SymbolNormalizer
-        
-        # Get pip value
-        pip_value = SymbolNormalizer.get_pip_value(symbol)
-        pip_multiplier = 1.0 / pip_value
-        
-        sl_pips = abs(entry - sl) * pip_multiplier
-        tp1_pips = abs(tp1 - entry) * pip_multiplier
-        tp2_pips = abs(tp2 - entry) * pip_multiplier
-        
-        # Get order type info
-        order_type = signal.get('order_type', 'Market Order')
-        immediate = signal.get('immediate_execution', True)
-        order_reason = signal.get('order_reason', 'Price at entry level')
-        
-        # Order status
-        if immediate:
-            order_status = "EXECUTE NOW"
-            order_marker = "[IMMEDIATE]"
-        else:
-            order_status = "PENDING ORDER"
-            order_marker = "[PENDING]"
+        sl_pips = abs(entry - signal['stop_loss']) * pip_multiplier
+        tp1_pips = abs(signal['take_profit_1'] - entry) * pip_multiplier
+        tp2_pips = abs(signal['take_profit_2'] - entry) * pip_multiplier
         
-        message = f"""
-{direction_marker} TRADING SIGNAL {order_marker}
-
-Symbol: {symbol}
-Direction: {signal['direction']}
-Scenario: {signal.get('scenario', 'N/A')}
-POI Type: {signal.get('poi_type', 'N/A')}
-
-ORDER TYPE: {order_type}
-Status: {order_status}
-Reason: {order_reason}
-
-CURRENT PRICE: {current:.5f}
-ENTRY PRICE: {entry:.5f}
-
-STOP LOSS: {sl:.5f}
-SL Distance: {sl_pips:.1f} pips
-
-TAKE PROFIT 1: {tp1:.5f}
-TP1 Distance: {tp1_pips:.1f} pips
-R:R TP1: 1:{signal.get('risk_reward_tp1', 0):.2f}
-
-TAKE PROFIT 2: {tp2:.5f}
-TP2 Distance: {tp2_pips:.1f} pips
-R:R TP2: 1:{signal.get('risk_reward_tp2', 0):.2f}
-
-ANALYSIS:
-Confidence: {signal['confidence']*100:.1f}%
-ML Prediction: {signal['ml_prediction']['ensemble']} (Conf: {signal['ml_prediction']['confidence']*100:.1f}%)
-Sentiment: {signal['sentiment']['label'].upper()} ({signal['sentiment']['score']:.2f})
-
-VALIDATION:
-Inducement Swept: {'Yes' if signal.get('inducement_swept', False) else 'No'}
-FVG Validation: {'Yes' if signal.get('fvg_validation', False) else 'No'}
-
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-
-Risk Disclaimer: Use proper risk management. Suggested position size: 1-2% of capital.
-        """
+        message = _format_signal(signal, sl_pips, tp1_pips, tp2_pips)
         
-        self._send_to_all_subscribers(message.strip())
-        self._send_discord(message.strip(), "Trading Signal")
+        self._enqueue("all", message, "Trading Signal")
+    
+    def send_signals_bulk(self, signals: List[Dict]):
+        """Send many trading signals, computing pip distances in one vector pass."""
+        if not self._any_enabled or not signals:
+            return
+        
+        count = len(signals)
+        
+        def column(key: str) -> np.ndarray:
+            return np.fromiter((signal[key] for signal in signals), dtype=np.float64, count=count)
+        
+        entries = column('entry_price')
+        pip_multipliers = np.fromiter(
+            (_pip_multiplier(signal['symbol']) for signal in signals),
+            dtype=np.float64,
+            count=count
+        )
+        
+        # Calculate pips for every signal at once
+        sl_pips = np.abs(entries - column('stop_loss')) * pip_multipliers
+        tp1_pips = np.abs(column('take_profit_1') - entries) * pip_multipliers
+        tp2_pips = np.abs(column('take_profit_2') - entries) * pip_multipliers
+        
+        for signal, sl, tp1, tp2 in zip(signals, sl_pips.tolist(), tp1_pips.tolist(), tp2_pips.tolist()):
+            self._enqueue("all", _format_signal(signal, sl, tp1, tp2), "Trading Signal")
     
     def send_trade_execution(self, action: str, details: Dict):
         """Send trade execution notification."""
+        if not self._any_enabled:
+            return
         
         action_markers = {
             'OPENED': '[TRADE OPENED]',
@@ -417,13 +709,14 @@ Quantity: {details.get('quantity', 'N/A')} lots
         if 'ticket' in details:
             message += f"\nTicket: {details['ticket']}"
         
-        message += f"\n\nTime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        message += f"\n\nTime: {_timestamp()}"
         
-        self._send_to_all_subscribers(message.strip())
-        self._send_discord(message.strip(), f"Trade {action}")
+        self._enqueue("all", message.strip(), f"Trade {action}")
     
     def send_daily_summary(self, summary: Dict):
         """Send daily performance summary."""
+        if not self._any_enabled:
+            return
         
         pnl = summary.get('daily_pnl', 0)
         pnl_marker = "[PROFIT DAY]" if pnl > 0 else "[LOSS DAY]" if pnl < 0 else "[BREAKEVEN DAY]"
@@ -448,11 +741,12 @@ OPEN POSITIONS:
 Active Trades: {summary.get('open_positions', 0)}
         """
         
-        self._send_to_all_subscribers(message.strip())
-        self._send_discord(message.strip(), "Daily Summary")
+        self._enqueue("all", message.strip(), "Daily Summary")
     
     def send_error_alert(self, error_type: str, message: str):
         """Send error alert notification."""
+        if not self._any_enabled:
+            return
         
         alert = f"""
 [ALERT] ERROR DETECTED
@@ -460,16 +754,17 @@ Active Trades: {summary.get('open_positions', 0)}
 Type: {error_type}
 Message: {message}
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Time: {_timestamp()}
 
 Action Required: Please check bot logs for detailed information.
         """
         
-        self._send_to_all_subscribers(alert.strip())
-        self._send_discord(alert.strip(), "Error Alert")
+        self._enqueue("all", alert.strip(), "Error Alert")
     
     def send_bot_status(self, status: str, details: Optional[str] = None):
         """Send bot status notification."""
+        if not self._any_enabled:
+            return
         
         status_markers = {
             'STARTED': '[BOT STARTED]',
@@ -485,17 +780,18 @@ Action Required: Please check bot logs for detailed information.
 {marker}
 
 Status: {status}
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Time: {_timestamp()}
         """
         
         if details:
             message += f"\n\n{details}"
         
-        self._send_to_all_subscribers(message.strip())
-        self._send_discord(message.strip(), f"Bot Status: {status}")
+        self._enqueue("all", message.strip(), f"Bot Status: {status}")
     
     def send_pending_order_notification(self, details: Dict):
         """Send pending order notification."""
+        if not self._any_enabled:
+            return
         
         message = f"""
 [PENDING ORDER PLACED]
@@ -507,12 +803,12 @@ Order ID: {details.get('order', 'N/A')}
 
 Status: Waiting for price to reach entry level
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Time: {_timestamp()}
         """
         
-        self._send_to_all_subscribers(message.strip())
+        self._enqueue("telegram", message.strip())
     
-    def _send_to_all_subscribers(self, message: str):
+    async def _send_to_all_subscribers(self, message: str):
         """Send message to all active subscribers."""
         
         if not self.config.ENABLE_TELEGRAM or not self.telegram_bot:
@@ -529,8 +825,11 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
         fail_count = 0
         
         for chat_id in subscribers:
+            # One token per sendMessage from the chat's bucket and the global one
+            await self._acquire(TELEGRAM_OUT_LIMITER, chat_id)
+            await self._acquire(TELEGRAM_GLOBAL_LIMITER)
             try:
-                self.telegram_bot.send_message(
+                await self.telegram_bot.send_message(
                     chat_id=chat_id,
                     text=message,
                     parse_mode=None  # Plain text, no markdown
@@ -542,12 +841,24 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
         
         self.logger.info(f"Sent to {success_count} subscribers ({fail_count} failures)")
     
-    def _send_discord(self, message: str, title: str = "Notification"):
+    async def _send_discord(self, message: str, title: str = "Notification"):
         """Send message via Discord webhook."""
         
         if not self.config.ENABLE_DISCORD or not self.discord_webhook:
             return
         
+        client = await self._get_client()
+        if client is None:
+            self.logger.warning("httpx not installed - Discord disabled")
+            return
+        
+        digest = self._discord_digest(message, title)
+        if self._is_duplicate_discord(digest):
+            self.logger.debug("Duplicate Discord notification skipped")
+            return
+        
+        await self._acquire(DISCORD_OUT_LIMITER)
+        
         try:
             payload = {
                 "embeds": [{
@@ -558,13 +869,17 @@ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
                 }]
             }
             
-            response = requests.post(
+            body = _json_bytes(payload)
+            
+            response = await client.post(
                 self.discord_webhook,
-                json=payload,
-                timeout=10
+                content=body,
+                headers={"Content-Type": "application/json"}
             )
             
             if response.status_code == 204:
+                # Only delivered messages count, so a failed post can be retried
+                self._record_discord(digest)
                 self.logger.debug("Discord notification sent")
             else:
                 self.logger.error(f"Discord webhook returned {response.status_code}")
@@ -582,20 +897,20 @@ This is a test message from NYX Trading Bot.
 
 If you receive this, notifications are working correctly.
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Time: {_timestamp()}
 
 Total Subscribers: {self.user_db.get_subscriber_count()}
         """
         
         self.logger.info("Testing notifications...")
         
+        self._enqueue("all", test_message.strip(), "Test Notification")
+        
         if self.config.ENABLE_TELEGRAM:
-            self._send_to_all_subscribers(test_message.strip())
-            self.logger.info("Telegram test sent")
+            self.logger.info("Telegram test queued")
         
         if self.config.ENABLE_DISCORD:
-            self._send_discord(test_message.strip(), "Test Notification")
-            self.logger.info("Discord test sent")
+            self.logger.info("Discord test queued")
     
     def get_subscriber_count(self) -> int:
         """Get total number of active subscribers."""
@@ -613,6 +928,7 @@ if __name__ == "__main__":
     
     # Test notification
     notifier.test_notifications()
+    notifier.close()
     
     print("\nCheck your Telegram for test message!")
     print("Multi-User Notifier test completed!")
\ No newline at end of file
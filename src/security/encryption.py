@@ -7,18 +7,29 @@ Author: BLESSING OMOREGIE
 
 import os
 import base64
-from cryptography.fernet import Fernet
+import hashlib
+import tempfile
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.backends import default_backend
-from typing import Optional
+from typing import Dict, Optional
 import json
 
 
+KEY_CACHE_FILE = 'config/.keycache'
+FERNET_TOKEN_PREFIX = b'gAAAAA'
+
+# Derived ciphers by key fingerprint, shared by every instance in the process
+_CIPHER_CACHE: Dict[str, Fernet] = {}
+
+
 class CredentialEncryption:
     """
     Military-grade encryption for sensitive credentials.
-    Uses Fernet (symmetric encryption) with PBKDF2 key derivation.
+    Uses Fernet (symmetric encryption) with scrypt key derivation.
+    Data written under the previous PBKDF2-derived key is still decrypted.
     """
     
     def __init__(self, master_password: Optional[str] = None):
@@ -38,6 +49,8 @@ class CredentialEncryption:
                 )
         
         self.salt = self._get_or_create_salt()
+        self._master_password = master_password
+        self._legacy_cipher: Optional[Fernet] = None
         self.cipher = self._derive_cipher(master_password)
     
     def _get_or_create_salt(self) -> bytes:
@@ -59,16 +72,80 @@ class CredentialEncryption:
             return salt
     
     def _derive_cipher(self, password: str) -> Fernet:
-        """Derive encryption cipher from password using PBKDF2."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return Fernet(key)
+        """
+        Derive encryption cipher from password using scrypt.
+        
+        The derived key is cached in memory and in config/.keycache under a
+        fingerprint of KDF + salt + SHA-256(password), so further instances
+        and restarts skip the KDF. Rotating MASTER_KEY, the salt or the KDF
+        changes the fingerprint and forces a fresh derivation automatically.
+        """
+        fingerprint = hashlib.sha256(
+            b'scrypt' + self.salt + hashlib.sha256(password.encode()).digest()
+        ).hexdigest()
+        
+        cipher = _CIPHER_CACHE.get(fingerprint)
+        if cipher is not None:
+            return cipher
+        
+        key = self._load_cached_key(fingerprint)
+        
+        if key is None:
+            kdf = Scrypt(
+                salt=self.salt,
+                length=32,
+                n=2**14,
+                r=8,
+                p=1,
+                backend=default_backend()
+            )
+            key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+            self._store_cached_key(fingerprint, key)
+        
+        cipher = Fernet(key)
+        _CIPHER_CACHE[fingerprint] = cipher
+        return cipher
+    
+    def _get_legacy_cipher(self) -> Fernet:
+        """Derive (once) the PBKDF2 cipher used before the switch to scrypt."""
+        if self._legacy_cipher is None:
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=self.salt,
+                iterations=100000,
+                backend=default_backend()
+            )
+            key = base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
+            self._legacy_cipher = Fernet(key)
+        return self._legacy_cipher
+    
+    def _load_cached_key(self, fingerprint: str) -> Optional[bytes]:
+        """Return the cached key if it was derived from the same salt and password."""
+        try:
+            with open(KEY_CACHE_FILE, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        
+        if len(lines) == 2 and lines[0].decode() == fingerprint:
+            return lines[1]
+        return None
+    
+    def _store_cached_key(self, fingerprint: str, key: bytes):
+        """Atomically write the derived key cache (owner read/write only)."""
+        try:
+            os.makedirs('config', exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir='config', prefix='.keycache.')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(fingerprint.encode() + b'\n' + key)
+            try:
+                os.chmod(tmp_path, 0o600)
+            except:
+                pass
+            os.replace(tmp_path, KEY_CACHE_FILE)
+        except OSError:
+            pass
     
     def encrypt(self, data: str) -> str:
         """
@@ -78,24 +155,46 @@ class CredentialEncryption:
             data: Plain text to encrypt
             
         Returns:
-            Base64 encoded encrypted data
+            Fernet token (already URL-safe base64)
         """
-        encrypted = self.cipher.encrypt(data.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
+        return self.cipher.encrypt(data.encode()).decode('ascii')
     
     def decrypt(self, encrypted_data: str) -> str:
         """
         Decrypt encrypted data.
         
         Args:
-            encrypted_data: Base64 encoded encrypted data
+            encrypted_data: Fernet token (older double-base64 values accepted)
             
         Returns:
             Plain text
         """
-        decoded = base64.urlsafe_b64decode(encrypted_data.encode())
-        decrypted = self.cipher.decrypt(decoded)
-        return decrypted.decode()
+        token = encrypted_data.encode()
+        
+        # Fernet tokens start with version byte 0x80 ("gAAAAA" in base64);
+        # anything else was written with the old extra base64 layer
+        if not token.startswith(FERNET_TOKEN_PREFIX):
+            token = base64.urlsafe_b64decode(token)
+        
+        try:
+            decrypted = self.cipher.decrypt(token)
+        except InvalidToken:
+            # Encrypted before the scrypt migration
+            decrypted = self._get_legacy_cipher().decrypt(token)
+        
+        return decrypted.decode('utf-8')
+    
+    def migrate(self, encrypted_data: str) -> str:
+        """
+        Re-encrypt a stored value in the current format and key.
+        
+        Args:
+            encrypted_data: Value produced by any earlier version of encrypt()
+            
+        Returns:
+            Fernet token under the current key
+        """
+        return self.encrypt(self.decrypt(encrypted_data))
     
     def encrypt_credentials(self, credentials: dict) -> str:
         """
@@ -7,29 +7,82 @@ Location: src/security/rate_limiter.py
 """
 
 import time
-from collections import defaultdict, deque
-from typing import Dict, Tuple, Optional
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 from threading import Lock
 
+# Bound once: monotonic never jumps on clock steps and skips an attribute lookup
+_monotonic = time.monotonic
+
+
+class _LRUDict(OrderedDict):
+    """OrderedDict that evicts its least recently used entry past maxsize."""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 
 class SlidingWindowRateLimiter:
     """
     Sliding window rate limiter.
     More accurate than fixed window, prevents burst attacks.
+    
+    Each user owns a fixed ring of max_calls timestamps ([head, count, stamps]),
+    so admission is an O(1) compare against the oldest slot with no
+    per-call allocation. Users are striped across independently locked
+    shards so concurrent checks for different users rarely contend.
+    Per-user state is LRU-bounded, so memory stays flat even when clients
+    cycle through user ids.
     """
     
-    def __init__(self, max_calls: int = 10, time_window: int = 60):
+    SHARD_COUNT = 16
+    
+    def __init__(self, max_calls: int = 10, time_window: int = 60, max_users: int = 10000):
         """
         Initialize rate limiter.
         
         Args:
             max_calls: Maximum calls allowed in time window
             time_window: Time window in seconds
+            max_users: Maximum users tracked before evicting the least recent
         """
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls: Dict[int, deque] = defaultdict(deque)
-        self.lock = Lock()
+        shard_size = max(1, max_users // self.SHARD_COUNT)
+        self.shards: List[Tuple[Lock, Dict[int, list]]] = [
+            (Lock(), _LRUDict(shard_size)) for _ in range(self.SHARD_COUNT)
+        ]
+    
+    def _shard(self, user_id: int) -> Tuple[Lock, Dict[int, list]]:
+        """Get the (lock, calls) stripe owning this user."""
+        return self.shards[hash(user_id) & (self.SHARD_COUNT - 1)]
+    
+    def _count_active(self, window: list, cutoff: float) -> int:
+        """
+        Count recorded calls newer than cutoff.
+        
+        The ring is ordered oldest-to-newest starting at head, so the first
+        live slot is found by binary search: O(log max_calls) under the lock.
+        """
+        head, count, stamps = window
+        max_calls = self.max_calls
+        low, high = 0, count
+        
+        while low < high:
+            mid = (low + high) // 2
+            if stamps[(head + mid) % max_calls] > cutoff:
+                high = mid
+            else:
+                low = mid + 1
+        
+        return count - low
     
     def is_allowed(self, user_id: int) -> Tuple[bool, Optional[str]]:
         """
@@ -41,49 +94,62 @@ class SlidingWindowRateLimiter:
         Returns:
             Tuple of (is_allowed, error_message)
         """
-        with self.lock:
-            current_time = time.time()
+        lock, calls = self._shard(user_id)
+        
+        max_calls = self.max_calls
+        time_window = self.time_window
+        
+        with lock:
+            current_time = _monotonic()
             
-            # Get user's call history
-            user_calls = self.calls[user_id]
+            # Get user's call ring
+            window = calls.get(user_id)
+            if window is None:
+                window = [0, 0, array('d', bytes(8 * max_calls))]
+                calls[user_id] = window
+            else:
+                calls.move_to_end(user_id)
             
-            # Remove calls outside time window
-            while user_calls and current_time - user_calls[0] >= self.time_window:
-                user_calls.popleft()
+            head, count, stamps = window
             
-            # Check if limit exceeded
-            if len(user_calls) >= self.max_calls:
+            if count < max_calls:
+                # Ring not full yet: head stays at slot 0
+                stamps[count] = current_time
+                window[1] = count + 1
+                return True, None
+            
+            # Ring full: the oldest call must have left the window
+            oldest_call = stamps[head]
+            if current_time - oldest_call < time_window:
                 # Calculate time until next allowed call
-                oldest_call = user_calls[0]
-                wait_time = int(self.time_window - (current_time - oldest_call))
+                wait_time = int(time_window - (current_time - oldest_call))
                 
                 return False, f"Rate limit exceeded. Try again in {wait_time} seconds."
             
-            # Allow call and record it
-            user_calls.append(current_time)
-            
-            # Calculate remaining calls
-            remaining = self.max_calls - len(user_calls)
+            # Allow call and record it over the oldest slot
+            stamps[head] = current_time
+            window[0] = (head + 1) % max_calls
             
             return True, None
     
     def get_remaining_calls(self, user_id: int) -> int:
         """Get number of remaining calls for user."""
-        with self.lock:
-            current_time = time.time()
-            user_calls = self.calls[user_id]
-            
-            # Clean old calls
-            while user_calls and current_time - user_calls[0] >= self.time_window:
-                user_calls.popleft()
+        lock, calls = self._shard(user_id)
+        
+        with lock:
+            window = calls.get(user_id)
+            if window is None:
+                return self.max_calls
             
-            return max(0, self.max_calls - len(user_calls))
+            cutoff = _monotonic() - self.time_window
+            return max(0, self.max_calls - self._count_active(window, cutoff))
     
     def reset_user(self, user_id: int):
         """Reset rate limit for a specific user."""
-        with self.lock:
-            if user_id in self.calls:
-                self.calls[user_id].clear()
+        lock, calls = self._shard(user_id)
+        
+        with lock:
+            calls.pop(user_id, None)
     
     def cleanup_old_users(self, inactive_threshold: int = 3600):
         """
@@ -92,16 +158,28 @@ class SlidingWindowRateLimiter:
         Args:
             inactive_threshold: Seconds of inactivity before cleanup
         """
-        with self.lock:
-            current_time = time.time()
-            users_to_remove = []
-            
-            for user_id, user_calls in self.calls.items():
-                if not user_calls or current_time - user_calls[-1] > inactive_threshold:
-                    users_to_remove.append(user_id)
-            
-            for user_id in users_to_remove:
-                del self.calls[user_id]
+        for lock, calls in self.shards:
+            with lock:
+                current_time = _monotonic()
+                
+                # Shards are kept in least-recently-used order, so stale users
+                # sit at the front: stop at the first active one
+                while calls:
+                    head, count, stamps = next(iter(calls.values()))
+                    last_call = stamps[(head + count - 1) % self.max_calls]
+                    if count and current_time - last_call <= inactive_threshold:
+                        break
+                    calls.popitem(last=False)
+
+
+class _Bucket:
+    """Token state for one user."""
+    
+    __slots__ = ('tokens', 'last_update')
+    
+    def __init__(self, tokens: float, last_update: float):
+        self.tokens = tokens
+        self.last_update = last_update
 
 
 class TokenBucketRateLimiter:
@@ -110,20 +188,18 @@ class TokenBucketRateLimiter:
     Allows bursts while maintaining average rate.
     """
     
-    def __init__(self, rate: float = 1.0, capacity: int = 10):
+    def __init__(self, rate: float = 1.0, capacity: int = 10, max_users: int = 10000):
         """
         Initialize token bucket.
         
         Args:
             rate: Tokens added per second
             capacity: Maximum tokens in bucket
+            max_users: Maximum users tracked before evicting the least recent
         """
         self.rate = rate
         self.capacity = capacity
-        self.buckets: Dict[int, Dict] = defaultdict(lambda: {
-            'tokens': capacity,
-            'last_update': time.time()
-        })
+        self.buckets: Dict[int, _Bucket] = _LRUDict(max_users)
         self.lock = Lock()
     
     def is_allowed(self, user_id: int, tokens_required: int = 1) -> Tuple[bool, Optional[str]]:
@@ -137,33 +213,46 @@ class TokenBucketRateLimiter:
         Returns:
             Tuple of (is_allowed, error_message)
         """
+        buckets = self.buckets
+        rate = self.rate
+        capacity = self.capacity
+        
         with self.lock:
-            bucket = self.buckets[user_id]
-            current_time = time.time()
+            current_time = _monotonic()
+            
+            bucket = buckets.get(user_id)
+            if bucket is None:
+                bucket = _Bucket(capacity, current_time)
+                buckets[user_id] = bucket
+            else:
+                buckets.move_to_end(user_id)
             
             # Add tokens based on time elapsed
-            time_elapsed = current_time - bucket['last_update']
-            tokens_to_add = time_elapsed * self.rate
-            bucket['tokens'] = min(self.capacity, bucket['tokens'] + tokens_to_add)
-            bucket['last_update'] = current_time
+            time_elapsed = current_time - bucket.last_update
+            tokens = min(capacity, bucket.tokens + time_elapsed * rate)
+            bucket.last_update = current_time
             
             # Check if enough tokens
-            if bucket['tokens'] >= tokens_required:
-                bucket['tokens'] -= tokens_required
+            if tokens >= tokens_required:
+                bucket.tokens = tokens - tokens_required
                 return True, None
             else:
-                wait_time = int((tokens_required - bucket['tokens']) / self.rate)
+                bucket.tokens = tokens
+                wait_time = int((tokens_required - tokens) / rate)
                 return False, f"Rate limit exceeded. Try again in {wait_time} seconds."
     
     def get_available_tokens(self, user_id: int) -> float:
         """Get number of available tokens for user."""
         with self.lock:
-            bucket = self.buckets[user_id]
-            current_time = time.time()
+            bucket = self.buckets.get(user_id)
+            if bucket is None:
+                return float(self.capacity)
+            
+            current_time = _monotonic()
             
-            time_elapsed = current_time - bucket['last_update']
+            time_elapsed = current_time - bucket.last_update
             tokens_to_add = time_elapsed * self.rate
-            available = min(self.capacity, bucket['tokens'] + tokens_to_add)
+            available = min(self.capacity, bucket.tokens + tokens_to_add)
             
             return available
 
@@ -6,8 +6,53 @@ Author: BLESSING OMOREGIE
 """
 
 import re
+import string
+from time import monotonic
+from collections import deque
 from typing import Any, Optional, Tuple
-from decimal import Decimal, InvalidOperation
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+# Literals at least one of which every SQL_INJECTION_PATTERNS match contains
+# ("=" covers the OR/AND comparisons)
+SQL_TRIGGER_LITERALS = (
+    "drop", "delete", "insert", "update", "union", "exec",
+    "--", "#", "/*", "*/", "=",
+)
+
+
+def _build_trigger_automaton():
+    """Aho-Corasick automaton over SQL_TRIGGER_LITERALS (None if unavailable)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for literal in SQL_TRIGGER_LITERALS:
+        automaton.add_word(literal, literal)
+    automaton.make_automaton()
+    return automaton
+
+
+_SQL_TRIGGERS = _build_trigger_automaton()
+
+
+def _parse_number(value: Any) -> float:
+    """
+    float(value), accepting the inputs Decimal(str(value)) accepted.
+    
+    Rejects bools (an int subclass) and goes through str() for other
+    non-builtin types, so bytes or Fraction('1/2') still fail.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Not a number: {value}")
+    if isinstance(value, (int, float, str)):
+        return float(value)
+    return float(str(value))
 
 
 class InputValidator:
@@ -30,6 +75,37 @@ class InputValidator:
         r"(;.*\bEXEC\b)",
     ]
     
+    # All injection patterns as one alternation: a single search per input
+    _SQL_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in SQL_INJECTION_PATTERNS),
+        re.IGNORECASE
+    )
+    
+    # Telegram chat IDs lie within +/-10^12; MT5 logins are at most 10^10
+    _CHAT_ID_MAX = 10**12
+    _MT5_LOGIN_MAX = 10**10
+    
+    # Deletes shell metacharacters; a shorter result means one was present
+    _DANGEROUS_TRANS = str.maketrans('', '', '|&;$`\n\r()<>')
+    
+    # Deletes every allowed account-name character; anything left is invalid
+    _ACCOUNT_TRANS = str.maketrans('', '', string.ascii_letters + string.digits + ' _-')
+    
+    @staticmethod
+    def _may_contain_sql(value: str) -> bool:
+        """
+        Single-pass literal prefilter for the injection regex.
+        
+        Scans the lowercased input once with an Aho-Corasick automaton; the
+        regex only needs to run when a trigger literal is present. Non-ASCII
+        input always goes to the regex, since IGNORECASE folds characters
+        that lower() does not.
+        """
+        if _SQL_TRIGGERS is None or not value.isascii():
+            return True
+        
+        return next(_SQL_TRIGGERS.iter(value.lower()), None) is not None
+    
     @staticmethod
     def sanitize_string(value: str, max_length: int = 255) -> str:
         """
@@ -56,9 +132,8 @@ class InputValidator:
             raise ValueError(f"Input exceeds maximum length of {max_length}")
         
         # Check for SQL injection patterns
-        for pattern in InputValidator.SQL_INJECTION_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                raise ValueError("Potentially malicious input detected")
+        if InputValidator._may_contain_sql(value) and InputValidator._SQL_RE.search(value):
+            raise ValueError("Potentially malicious input detected")
         
         return value
     
@@ -76,11 +151,15 @@ class InputValidator:
         Raises:
             ValueError: If invalid
         """
+        # Fast path: chat IDs from Telegram updates are already ints
+        if type(chat_id) is int and -InputValidator._CHAT_ID_MAX <= chat_id <= InputValidator._CHAT_ID_MAX:
+            return chat_id
+        
         try:
             chat_id_int = int(chat_id)
             
             # Telegram chat IDs are typically between -10^12 and 10^12
-            if abs(chat_id_int) > 10**12:
+            if abs(chat_id_int) > InputValidator._CHAT_ID_MAX:
                 raise ValueError("Chat ID out of valid range")
             
             return chat_id_int
@@ -102,6 +181,10 @@ class InputValidator:
         Raises:
             ValueError: If invalid
         """
+        # Fast path: a plain int already in range
+        if type(login) is int and 0 < login <= InputValidator._MT5_LOGIN_MAX:
+            return login
+        
         try:
             login_int = int(login)
             
@@ -109,7 +192,7 @@ class InputValidator:
                 raise ValueError("MT5 login must be positive")
             
             # MT5 logins are typically 6-9 digits
-            if login_int > 10**10:
+            if login_int > InputValidator._MT5_LOGIN_MAX:
                 raise ValueError("MT5 login out of valid range")
             
             return login_int
@@ -156,8 +239,7 @@ class InputValidator:
             ValueError: If invalid
         """
         try:
-            lot_size_decimal = Decimal(str(lot_size))
-            lot_size_float = float(lot_size_decimal)
+            lot_size_float = _parse_number(lot_size)
             
             if lot_size_float <= 0:
                 raise ValueError("Lot size must be positive")
@@ -168,7 +250,7 @@ class InputValidator:
             # Round to 2 decimal places
             return round(lot_size_float, 2)
             
-        except (InvalidOperation, ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
             raise ValueError(f"Invalid lot size: {lot_size}")
     
     @staticmethod
@@ -186,8 +268,7 @@ class InputValidator:
             ValueError: If invalid
         """
         try:
-            price_decimal = Decimal(str(price))
-            price_float = float(price_decimal)
+            price_float = _parse_number(price)
             
             if price_float <= 0:
                 raise ValueError("Price must be positive")
@@ -197,7 +278,7 @@ class InputValidator:
             
             return price_float
             
-        except (InvalidOperation, ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
             raise ValueError(f"Invalid price: {price}")
     
     @staticmethod
@@ -216,6 +297,10 @@ class InputValidator:
         Raises:
             ValueError: If invalid
         """
+        # bool is an int subclass; float(True) would pass as 1.0
+        if isinstance(percentage, bool):
+            raise ValueError(f"Invalid percentage: {percentage}")
+        
         try:
             pct_float = float(percentage)
             
@@ -226,7 +311,7 @@ class InputValidator:
             
             return pct_float
             
-        except (ValueError, TypeError):
+        except (ValueError, TypeError, OverflowError):
             raise ValueError(f"Invalid percentage: {percentage}")
     
     @staticmethod
@@ -249,7 +334,7 @@ class InputValidator:
             raise ValueError("Account name must be at least 3 characters")
         
         # Only allow alphanumeric, spaces, hyphens, underscores
-        if not re.match(r'^[a-zA-Z0-9 _-]+$', name):
+        if name.translate(InputValidator._ACCOUNT_TRANS):
             raise ValueError(
                 "Account name can only contain letters, numbers, spaces, hyphens, and underscores"
             )
@@ -274,9 +359,7 @@ class InputValidator:
         arg = InputValidator.sanitize_string(arg)
         
         # Check for shell metacharacters
-        dangerous_chars = ['|', '&', ';', '$', '`', '\n', '\r', '(', ')', '<', '>']
-        
-        if any(char in arg for char in dangerous_chars):
+        if len(arg.translate(InputValidator._DANGEROUS_TRANS)) != len(arg):
             raise ValueError(
                 f"Invalid {arg_name}: contains dangerous characters"
             )
@@ -299,7 +382,7 @@ class RateLimiter:
         """
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = {}  # user_id -> list of timestamps
+        self.calls = {}  # user_id -> deque of timestamps (oldest first)
     
     def is_allowed(self, user_id: int) -> Tuple[bool, Optional[str]]:
         """
@@ -311,24 +394,21 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, error_message)
         """
-        import time
-        
-        current_time = time.time()
+        current_time = monotonic()
         
-        if user_id not in self.calls:
-            self.calls[user_id] = []
+        user_calls = self.calls.get(user_id)
+        if user_calls is None:
+            user_calls = self.calls[user_id] = deque(maxlen=self.max_calls)
         
         # Remove calls outside time window
-        self.calls[user_id] = [
-            call_time for call_time in self.calls[user_id]
-            if current_time - call_time < self.time_window
-        ]
+        while user_calls and current_time - user_calls[0] >= self.time_window:
+            user_calls.popleft()
         
         # Check limit
-        if len(self.calls[user_id]) >= self.max_calls:
+        if len(user_calls) >= self.max_calls:
             return False, f"Rate limit exceeded. Maximum {self.max_calls} calls per {self.time_window} seconds."
         
         # Record this call
-        self.calls[user_id].append(current_time)
+        user_calls.append(current_time)
         
         return True, None
\ No newline at end of file
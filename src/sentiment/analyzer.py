@@ -7,31 +7,83 @@ Repository: nyx_trial
 Analyzes market sentiment from news and social data.
 """
 
-import pandas as pd
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import numpy as np
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 from ..utils.logger import get_logger
 
 
+# Per-process analyzer used by analyze_news_batch's worker pool
+_worker_analyzer = None
+
+
+def _init_worker(config):
+    """Pool initializer: build one analyzer per worker process."""
+    global _worker_analyzer
+    # The parent already owns the rotating log file; workers log to console
+    _worker_analyzer = SentimentAnalyzer(config, file_logging=False)
+
+
+def _analyze_in_worker(text: str) -> Dict:
+    """Pool task: score one text with the worker's analyzer."""
+    return _worker_analyzer.analyze_text(text)
+
+
 class SentimentAnalyzer:
     """
     Analyzes sentiment from news articles and text data.
     Uses multiple sentiment analysis methods and combines them.
     """
     
-    def __init__(self, config):
+    # Distinct texts remembered by analyze_text (duplicate headlines are common)
+    TEXT_CACHE_SIZE = 4096
+    
+    # Distinct uncached texts needed before a batch is spread over processes
+    PARALLEL_BATCH_MIN = 256
+    
+    # Symbol mapping for better article matching
+    SYMBOL_KEYWORDS = {
+        'EURUSD': ('euro', 'eur', 'usd', 'dollar', 'europe', 'fed', 'ecb'),
+        'GBPUSD': ('pound', 'gbp', 'sterling', 'uk', 'britain', 'boe'),
+        'USDJPY': ('yen', 'jpy', 'japan', 'boj'),
+        'XAUUSD': ('gold', 'xau', 'precious', 'metal'),
+        'BTCUSD': ('bitcoin', 'btc', 'crypto', 'cryptocurrency'),
+        'US30': ('dow', 'dow jones', 'us30', 'stock'),
+        'NAS100': ('nasdaq', 'tech', 'technology'),
+    }
+    
+    # symbol -> relevance automaton over its keywords, built on first use
+    _SYMBOL_AUTOMATA: Dict[str, object] = {}
+    
+    # Indexed by the number of thresholds a score clears (see _label)
+    LABELS = ('bearish', 'neutral', 'bullish')
+    
+    def __init__(self, config, file_logging: bool = True):
         """
         Initialize sentiment analyzer.
         
         Args:
             config: Settings object
+            file_logging: Also log to config.LOG_FILE_PATH (off in pool workers)
         """
         self.config = config
-        self.logger = get_logger(__name__, config.LOG_LEVEL, config.LOG_FILE_PATH)
+        self.logger = get_logger(
+            __name__, config.LOG_LEVEL, config.LOG_FILE_PATH if file_logging else None
+        )
         
         # Initialize VADER sentiment analyzer
         self.vader = SentimentIntensityAnalyzer()
@@ -48,13 +100,45 @@ class SentimentAnalyzer:
             'negative', 'weak', 'sell', 'downtrend', 'breakdown', 'resistance',
             'distribution', 'fear', 'pessimistic', 'loss', 'dump'
         ]
+        
+        # One automaton for both keyword lists: a single pass per text
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for keyword in self.bullish_keywords:
+                self._keyword_automaton.add_word(keyword, (1, keyword))
+            for keyword in self.bearish_keywords:
+                self._keyword_automaton.add_word(keyword, (-1, keyword))
+            self._keyword_automaton.make_automaton()
+        
+        # text -> analyze_text result, least recently used first
+        self._text_cache: OrderedDict = OrderedDict()
+        
+        self._bearish_threshold = config.SENTIMENT_THRESHOLD_BEARISH
+        self._bullish_threshold = config.SENTIMENT_THRESHOLD_BULLISH
+        
+        # Worker pool for large batches, started on first use (see _get_pool)
+        self._pool = None
+        self._pool_lock = threading.Lock()
     
-    def analyze_text(self, text: str) -> Dict:
+    def _label(self, score: float) -> str:
+        """
+        Map a score to its sentiment label without branching.
+        
+        A score at or above the bullish threshold is bullish, one at or below
+        the bearish threshold is bearish; anything in between is neutral.
+        """
+        return self.LABELS[
+            (score > self._bearish_threshold) + (score >= self._bullish_threshold)
+        ]
+    
+    def analyze_text(self, text: str, text_lower: Optional[str] = None) -> Dict:
         """
         Analyze sentiment of a single text.
         
         Args:
             text: Text to analyze
+            text_lower: text.lower(), if the caller already computed it
             
         Returns:
             Dictionary with sentiment scores
@@ -67,40 +151,53 @@ class SentimentAnalyzer:
                 'method': 'none'
             }
         
+        cached = self._text_cache.get(text)
+        if cached is not None:
+            self._text_cache.move_to_end(text)
+            return dict(cached)
+        
         try:
             # Method 1: VADER (specialized for social media)
             vader_scores = self.vader.polarity_scores(text)
             vader_compound = vader_scores['compound']
             
-            # Method 2: TextBlob (general purpose)
-            blob = TextBlob(text)
-            textblob_polarity = blob.sentiment.polarity
-            
-            # Method 3: Keyword-based (financial specific)
-            keyword_score = self._analyze_keywords(text)
-            
-            # Combine scores (weighted average)
-            combined_score = (
-                vader_compound * 0.4 +
-                textblob_polarity * 0.3 +
-                keyword_score * 0.3
-            )
+            # Method 2: Keyword-based (financial specific)
+            keyword_score = self._analyze_keywords(text, text_lower)
+            
+            if (
+                self.config.SENTIMENT_FAST_PATH
+                and abs(vader_compound) > 0.5
+                and vader_compound * keyword_score > 0
+            ):
+                # VADER and keywords strongly agree: skip TextBlob, by far
+                # the slowest method, and reweight the other two
+                textblob_polarity = 0.0
+                combined_score = (
+                    vader_compound * 0.4 +
+                    keyword_score * 0.3
+                ) / 0.7
+            else:
+                # Method 3: TextBlob (general purpose)
+                blob = TextBlob(text)
+                textblob_polarity = blob.sentiment.polarity
+                
+                # Combine scores (weighted average)
+                combined_score = (
+                    vader_compound * 0.4 +
+                    textblob_polarity * 0.3 +
+                    keyword_score * 0.3
+                )
             
             # Normalize to -1 to 1 range
             combined_score = max(-1.0, min(1.0, combined_score))
             
             # Determine label
-            if combined_score >= self.config.SENTIMENT_THRESHOLD_BULLISH:
-                label = 'bullish'
-            elif combined_score <= self.config.SENTIMENT_THRESHOLD_BEARISH:
-                label = 'bearish'
-            else:
-                label = 'neutral'
+            label = self._label(combined_score)
             
             # Calculate confidence (absolute value)
             confidence = abs(combined_score)
             
-            return {
+            result = {
                 'score': round(combined_score, 3),
                 'label': label,
                 'confidence': round(confidence, 3),
@@ -109,6 +206,11 @@ class SentimentAnalyzer:
                 'keyword': round(keyword_score, 3)
             }
             
+            self._remember(text, result)
+            
+            # Callers annotate results (e.g. 'weight'), so hand out a copy
+            return dict(result)
+            
         except Exception as e:
             self.logger.exception(f"Error analyzing text: {e}")
             return {
@@ -118,6 +220,75 @@ class SentimentAnalyzer:
                 'method': 'error'
             }
     
+    def _remember(self, text: str, result: Dict):
+        """Store an analyze_text result, evicting the least recently used."""
+        self._text_cache[text] = result
+        if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+    
+    def _get_pool(self):
+        """
+        The worker pool, created on first use and reused across batches.
+        
+        Workers are spawned, not forked: the bot process runs several
+        threads, and forking while one of them holds a lock (a logging
+        handler's, say) can leave the child deadlocked.
+        
+        Returns:
+            multiprocessing Pool, or None on a single-CPU host
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                processes = os.cpu_count() or 1
+                if processes < 2:
+                    return None
+                context = multiprocessing.get_context("spawn")
+                self._pool = context.Pool(
+                    processes, initializer=_init_worker, initargs=(self.config,)
+                )
+                # Owners should call close(); this reaps the workers otherwise
+                atexit.register(self.close)
+            return self._pool
+    
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+                atexit.unregister(self.close)
+    
+    def _analyze_parallel(self, texts: List[str]) -> Dict[str, Dict]:
+        """
+        Score distinct texts across the worker pool.
+        
+        Each worker builds its own analyzer from self.config, so nothing
+        but the texts and plain result dicts crosses process boundaries.
+        
+        Args:
+            texts: Distinct, uncached texts
+            
+        Returns:
+            text -> analyze_text result (empty if the pool is unavailable)
+        """
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                return {}
+            results = pool.map(_analyze_in_worker, texts, chunksize=32)
+        except Exception as e:
+            self.logger.warning(f"Parallel sentiment analysis unavailable, running serially: {e}")
+            return {}
+        
+        analyzed = {}
+        for text, result in zip(texts, results):
+            if result.get('method') != 'error':
+                self._remember(text, result)
+            analyzed[text] = result
+        
+        return analyzed
+    
     def analyze_news_batch(self, news_articles: List[Dict]) -> Dict:
         """
         Analyze sentiment from multiple news articles.
@@ -138,15 +309,26 @@ class SentimentAnalyzer:
             }
         
         try:
-            sentiments = []
-            
+            # Combine title and description for analysis
+            texts = []
             for article in news_articles:
-                # Combine title and description for analysis
-                text = f"{article.get('title', '')} {article.get('description', '')}"
-                
+                text = self._article_text(article)
                 if text.strip():
-                    sentiment = self.analyze_text(text)
-                    sentiments.append(sentiment)
+                    texts.append(text)
+            
+            # Large feeds: score the distinct uncached texts in parallel first
+            analyzed = {}
+            pending = [
+                text for text in dict.fromkeys(texts)
+                if text not in self._text_cache
+            ]
+            if len(pending) >= self.PARALLEL_BATCH_MIN:
+                analyzed = self._analyze_parallel(pending)
+            
+            sentiments = [
+                dict(analyzed[text]) if text in analyzed else self.analyze_text(text)
+                for text in texts
+            ]
             
             if not sentiments:
                 return {
@@ -156,30 +338,30 @@ class SentimentAnalyzer:
                     'article_count': 0
                 }
             
-            # Calculate weighted average
-            scores = [s['score'] for s in sentiments]
-            confidences = [s['confidence'] for s in sentiments]
+            # Collect scores, confidences and labels once; aggregate in numpy
+            count = len(sentiments)
+            scores = np.fromiter((s['score'] for s in sentiments), dtype=np.float64, count=count)
+            confidences = np.fromiter((s['confidence'] for s in sentiments), dtype=np.float64, count=count)
+            label_index = np.array(
+                [self.LABELS.index(s['label']) for s in sentiments], dtype=np.intp
+            )
             
             # Weight by confidence
-            weighted_score = sum(
-                score * conf for score, conf in zip(scores, confidences)
-            ) / sum(confidences) if sum(confidences) > 0 else 0.0
+            total_confidence = confidences.sum()
+            weighted_score = float(
+                (scores * confidences).sum() / total_confidence
+            ) if total_confidence > 0 else 0.0
             
             # Average confidence
-            avg_confidence = np.mean(confidences)
+            avg_confidence = float(confidences.mean())
             
             # Determine label
-            if weighted_score >= self.config.SENTIMENT_THRESHOLD_BULLISH:
-                label = 'bullish'
-            elif weighted_score <= self.config.SENTIMENT_THRESHOLD_BEARISH:
-                label = 'bearish'
-            else:
-                label = 'neutral'
+            label = self._label(weighted_score)
             
             # Count distribution
-            bullish_count = sum(1 for s in sentiments if s['label'] == 'bullish')
-            bearish_count = sum(1 for s in sentiments if s['label'] == 'bearish')
-            neutral_count = sum(1 for s in sentiments if s['label'] == 'neutral')
+            bearish_count, neutral_count, bullish_count = (
+                np.bincount(label_index, minlength=len(self.LABELS)).tolist()
+            )
             
             result = {
                 'score': round(weighted_score, 3),
@@ -245,6 +427,7 @@ class SentimentAnalyzer:
         
         try:
             # Filter articles relevant to symbol
+            # (article, text, lowered text) for articles relevant to symbol
             relevant_articles = self._filter_relevant_articles(symbol, news_articles)
             
             if not relevant_articles:
@@ -258,29 +441,36 @@ class SentimentAnalyzer:
             
             # Analyze with time decay
             sentiments = []
+            hours_old = []
             current_time = datetime.now()
             
-            for article in relevant_articles:
+            for article, text, text_lower in relevant_articles:
                 # Get article timestamp
                 published_at = article.get('publishedAt')
                 if isinstance(published_at, str):
+                    # fromisoformat only accepts a trailing 'Z' from Python 3.11
+                    if published_at.endswith('Z'):
+                        published_at = published_at[:-1] + '+00:00'
                     try:
-                        published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                        published_at = datetime.fromisoformat(published_at)
                     except:
                         published_at = current_time
                 elif not isinstance(published_at, datetime):
                     published_at = current_time
                 
-                # Calculate time decay weight
-                hours_old = (current_time - published_at).total_seconds() / 3600
-                decay_factor = np.exp(-hours_old / time_decay_hours)
+                # Compare in naive local time, like current_time
+                if published_at.tzinfo is not None:
+                    published_at = published_at.astimezone().replace(tzinfo=None)
                 
-                # Analyze sentiment
-                text = f"{article.get('title', '')} {article.get('description', '')}"
-                sentiment = self.analyze_text(text)
-                sentiment['weight'] = decay_factor
+                hours_old.append((current_time - published_at).total_seconds() / 3600)
                 
-                sentiments.append(sentiment)
+                # Analyze sentiment, reusing the lowered text from filtering
+                sentiments.append(self.analyze_text(text, text_lower))
+            
+            # Calculate time decay weights in one vectorized call
+            decay_factors = np.exp(-np.asarray(hours_old) / time_decay_hours)
+            for sentiment, decay_factor in zip(sentiments, decay_factors.tolist()):
+                sentiment['weight'] = decay_factor
             
             # Calculate weighted score
             total_weight = sum(s['weight'] for s in sentiments)
@@ -292,12 +482,7 @@ class SentimentAnalyzer:
             avg_confidence = np.mean([s['confidence'] for s in sentiments])
             
             # Determine label
-            if weighted_score >= self.config.SENTIMENT_THRESHOLD_BULLISH:
-                label = 'bullish'
-            elif weighted_score <= self.config.SENTIMENT_THRESHOLD_BEARISH:
-                label = 'bearish'
-            else:
-                label = 'neutral'
+            label = self._label(weighted_score)
             
             result = {
                 'symbol': symbol,
@@ -325,25 +510,43 @@ class SentimentAnalyzer:
                 'article_count': 0
             }
     
-    def _analyze_keywords(self, text: str) -> float:
+    def _analyze_keywords(self, text: str, text_lower: Optional[str] = None) -> float:
         """
         Analyze text using financial keywords.
         
         Args:
             text: Text to analyze
+            text_lower: text.lower(), if the caller already computed it
             
         Returns:
             Sentiment score based on keywords
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Count keyword occurrences
-        bullish_count = sum(
-            text_lower.count(keyword) for keyword in self.bullish_keywords
-        )
-        bearish_count = sum(
-            text_lower.count(keyword) for keyword in self.bearish_keywords
-        )
+        if self._keyword_automaton is not None:
+            bullish_count = 0
+            bearish_count = 0
+            last_end = {}
+            
+            for end, (sign, keyword) in self._keyword_automaton.iter(text_lower):
+                # Skip self-overlapping hits to match str.count semantics
+                if end - len(keyword) < last_end.get(keyword, -1):
+                    continue
+                last_end[keyword] = end
+                
+                if sign > 0:
+                    bullish_count += 1
+                else:
+                    bearish_count += 1
+        else:
+            bullish_count = sum(
+                text_lower.count(keyword) for keyword in self.bullish_keywords
+            )
+            bearish_count = sum(
+                text_lower.count(keyword) for keyword in self.bearish_keywords
+            )
         
         total_count = bullish_count + bearish_count
         
@@ -355,11 +558,16 @@ class SentimentAnalyzer:
         
         return score
     
+    @staticmethod
+    def _article_text(article: Dict) -> str:
+        """Title and description of an article, as analyzed."""
+        return f"{article.get('title', '')} {article.get('description', '')}"
+    
     def _filter_relevant_articles(
         self,
         symbol: str,
         articles: List[Dict]
-    ) -> List[Dict]:
+    ) -> List[Tuple[Dict, str, str]]:
         """
         Filter articles relevant to a trading symbol.
         
@@ -368,28 +576,32 @@ class SentimentAnalyzer:
             articles: List of articles
             
         Returns:
-            Filtered list of relevant articles
+            (article, text, lowered text) for each relevant article, so the
+            caller can score it without rebuilding or lowering the text
         """
-        # Symbol mapping for better matching
-        symbol_keywords = {
-            'EURUSD': ['euro', 'eur', 'usd', 'dollar', 'europe', 'fed', 'ecb'],
-            'GBPUSD': ['pound', 'gbp', 'sterling', 'uk', 'britain', 'boe'],
-            'USDJPY': ['yen', 'jpy', 'japan', 'boj'],
-            'XAUUSD': ['gold', 'xau', 'precious', 'metal'],
-            'BTCUSD': ['bitcoin', 'btc', 'crypto', 'cryptocurrency'],
-            'US30': ['dow', 'dow jones', 'us30', 'stock'],
-            'NAS100': ['nasdaq', 'tech', 'technology'],
-        }
-        
-        keywords = symbol_keywords.get(symbol, [symbol.lower()])
+        keywords = self.SYMBOL_KEYWORDS.get(symbol, (symbol.lower(),))
+        
+        automaton = self._SYMBOL_AUTOMATA.get(symbol)
+        if automaton is None and AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._SYMBOL_AUTOMATA[symbol] = automaton
         
         relevant = []
         for article in articles:
-            text = f"{article.get('title', '')} {article.get('description', '')}".lower()
+            text = self._article_text(article)
+            text_lower = text.lower()
             
             # Check if any keyword is in the article
-            if any(keyword in text for keyword in keywords):
-                relevant.append(article)
+            if automaton is not None:
+                is_relevant = next(automaton.iter(text_lower), None) is not None
+            else:
+                is_relevant = any(keyword in text_lower for keyword in keywords)
+            
+            if is_relevant:
+                relevant.append((article, text, text_lower))
         
         return relevant
 
@@ -0,0 +1,114 @@
+"""
+Compiled scan kernels for POI detection.
+Author: BLESSING OMOREGIE
+
+Pure-numeric loops over OHLC arrays, compiled with Numba when it is
+installed. POIDetector only calls them when NUMBA_AVAILABLE is True and
+otherwise uses its numpy mask path, so both must select the same candles.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels still define without Numba."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, boundscheck=False)
+def scan_order_blocks(open_, high_, low_, close_, start, stop, direction):
+    """
+    Order block candidates in [start, stop).
+    
+    direction is 1 (bullish: bearish candle followed by bullish
+    displacement) or -1 (bearish: the mirror image). A candidate needs 2
+    of the next 3 candles in the displacement direction, and their range
+    must exceed 1.5x the mean range of the 5 candles before it. The caller
+    keeps stop <= len - 3 so the next three candles exist.
+    
+    Returns:
+        Candidate indices, ascending
+    """
+    indices = np.empty(max(stop - start, 0), dtype=np.int64)
+    count = 0
+    
+    for i in range(start, stop):
+        if direction > 0:
+            if not close_[i] < open_[i]:
+                continue
+        elif not close_[i] > open_[i]:
+            continue
+        
+        displacement_count = 0
+        window_high = high_[i + 1]
+        window_low = low_[i + 1]
+        for k in range(i + 1, i + 4):
+            if direction > 0:
+                if close_[k] > open_[k]:
+                    displacement_count += 1
+            elif close_[k] < open_[k]:
+                displacement_count += 1
+            window_high = max(window_high, high_[k])
+            window_low = min(window_low, low_[k])
+        
+        if displacement_count < 2:
+            continue
+        
+        displacement_range = window_high - window_low
+        if i >= 5:
+            total = 0.0
+            for k in range(i - 5, i):
+                total += high_[k] - low_[k]
+            avg_range = total / 5
+        else:
+            avg_range = displacement_range
+        
+        if displacement_range > avg_range * 1.5:
+            indices[count] = i
+            count += 1
+    
+    return indices[:count]
+
+
+@njit(cache=True, boundscheck=False)
+def scan_breaker_blocks(open_, high_, low_, close_, start, stop, direction):
+    """
+    Breaker block candidates in [start, stop), before the body check.
+    
+    direction is 1 (bullish: next candle breaks below, then bearish
+    displacement) or -1 (bearish: breaks above, then bullish
+    displacement). The caller keeps stop <= len - 3.
+    
+    Returns:
+        Candidate indices, ascending
+    """
+    indices = np.empty(max(stop - start, 0), dtype=np.int64)
+    count = 0
+    
+    for i in range(start, stop):
+        if direction > 0:
+            if not low_[i + 1] < low_[i]:
+                continue
+        elif not high_[i + 1] > high_[i]:
+            continue
+        
+        displacement_count = 0
+        for k in range(i + 1, i + 4):
+            if direction > 0:
+                if close_[k] < open_[k]:
+                    displacement_count += 1
+            elif close_[k] > open_[k]:
+                displacement_count += 1
+        
+        if displacement_count >= 2:
+            indices[count] = i
+            count += 1
+    
+    return indices[:count]
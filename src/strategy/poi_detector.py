@@ -4,12 +4,17 @@ Author: BLESSING OMOREGIE
 
 """
 
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from ._poi_kernels import NUMBA_AVAILABLE, scan_order_blocks, scan_breaker_blocks
+
 
 class POIType(Enum):
     """Type of Point of Interest."""
@@ -18,9 +23,9 @@ class POIType(Enum):
     FAIR_VALUE_GAP = "FVG"
 
 
-@dataclass
+@dataclass(slots=True)
 class PointOfInterest:
-    """Represents a Point of Interest in the market."""
+    """Represents a Point of Interest in the market (slotted: no per-instance __dict__)."""
     poi_type: POIType
     price_high: float
     price_low: float
@@ -52,6 +57,20 @@ class PointOfInterest:
             return (self.body_high + self.body_low) / 2
 
 
+@dataclass(slots=True)
+class _CandleArrays:
+    """OHLC columns of one DataFrame as arrays, plus series shared by the scans."""
+    open_: np.ndarray
+    high_: np.ndarray
+    low_: np.ndarray
+    close_: np.ndarray
+    body_high: np.ndarray
+    body_low: np.ndarray
+    timestamps: Optional[np.ndarray]  # Index values, only for period-style indexes
+    forward_extremes: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    displacement: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+
 class POIDetector:
     """
     FIXED: Proper POI detection with 200-candle lookback on LTF
@@ -89,6 +108,14 @@ class POIDetector:
             self.max_poi_distance = 50
         
         self.fvg_min_size_percent = 0.1
+        
+        # Streaming state for update(): OHLC rows of a growing buffer, and
+        # per direction (+1/-1) the live order-block candidates (candle
+        # index -> unmitigated) plus the indices already reported
+        self._stream_ohlc = np.empty((4, 0))
+        self._stream_length = 0
+        self._stream_candidates: Dict[int, Dict[int, bool]] = {1: {}, -1: {}}
+        self._stream_reported: Dict[int, set] = {1: set(), -1: set()}
     
     def detect_order_blocks(
         self,
@@ -102,6 +129,163 @@ class POIDetector:
         
         FIXED: Now properly scans last 200 candles on LTF
         """
+        return self._find_order_blocks(
+            df, self._candle_arrays(df), direction, inducement_index, structure_break_index
+        )
+    
+    def detect_breaker_blocks(
+        self,
+        df: pd.DataFrame,
+        direction: str = "bullish",
+        inducement_index: Optional[int] = None,
+        structure_break_index: Optional[int] = None
+    ) -> List[PointOfInterest]:
+        """
+        Detect Breaker Blocks with CORRECT 200-candle lookback.
+        """
+        return self._find_breaker_blocks(
+            df, self._candle_arrays(df), direction, inducement_index, structure_break_index
+        )
+    
+    def detect_fair_value_gaps(self, df, direction) -> List[PointOfInterest]:
+        """Detect FVGs (unchanged - already correct)."""
+        return self._find_fair_value_gaps(df, self._candle_arrays(df), direction)
+    
+    def scan_all_pois(
+        self,
+        df: pd.DataFrame,
+        direction: str = "bullish",
+        inducement_index: Optional[int] = None,
+        structure_break_index: Optional[int] = None
+    ) -> Tuple[List[PointOfInterest], List[PointOfInterest], List[PointOfInterest]]:
+        """
+        Detect order blocks, breaker blocks and FVGs in one pass over df.
+        
+        Same results as calling the three detect_* methods, but the OHLC
+        arrays, forward extremes and displacement windows are built once.
+        inducement_index and structure_break_index apply to the order and
+        breaker blocks; FVGs always cover the whole frame.
+        
+        Returns:
+            (order_blocks, breaker_blocks, fair_value_gaps)
+        """
+        arrays = self._candle_arrays(df)
+        
+        return (
+            self._find_order_blocks(df, arrays, direction, inducement_index, structure_break_index),
+            self._find_breaker_blocks(df, arrays, direction, inducement_index, structure_break_index),
+            self._find_fair_value_gaps(df, arrays, direction),
+        )
+    
+    def update(self, new_bar: Dict[str, float]):
+        """
+        Append one closed candle to the streaming order-block state.
+        
+        Each call only evaluates the candle that just gained its three
+        displacement candles and re-checks the live candidates against the
+        new candle, instead of rescanning the lookback. Streaming follows
+        the detect_order_blocks defaults (scan and inducement at the latest
+        candle) for both directions.
+        
+        Args:
+            new_bar: Mapping with 'open', 'high', 'low' and 'close'
+        """
+        n = self._stream_length
+        if n == self._stream_ohlc.shape[1]:
+            # Grow by doubling so appends stay amortized O(1)
+            grown = np.empty((4, max(2 * n, 256)))
+            grown[:, :n] = self._stream_ohlc[:, :n]
+            self._stream_ohlc = grown
+        
+        self._stream_ohlc[:, n] = (new_bar['open'], new_bar['high'], new_bar['low'], new_bar['close'])
+        n += 1
+        self._stream_length = n
+        
+        open_, high_, low_, close_ = self._stream_ohlc[:, :n]
+        latest = n - 1
+        
+        for sign, candidates in self._stream_candidates.items():
+            # Only the new candle can mitigate a candidate (50% mean threshold)
+            for i, unmitigated in candidates.items():
+                if unmitigated:
+                    mean_threshold = (high_[i] + low_[i]) / 2
+                    if sign > 0:
+                        candidates[i] = not low_[latest] <= mean_threshold
+                    else:
+                        candidates[i] = not high_[latest] >= mean_threshold
+            
+            # The candle with exactly three successors is newly evaluable
+            i = n - 4
+            if i >= 0 and len(scan_order_blocks(open_, high_, low_, close_, i, i + 1, sign)):
+                mean_threshold = (high_[i] + low_[i]) / 2
+                if sign > 0:
+                    candidates[i] = not np.fmin.reduce(low_[i+1:n]) <= mean_threshold
+                else:
+                    candidates[i] = not np.fmax.reduce(high_[i+1:n]) >= mean_threshold
+            
+            # Candidates only get further away; drop them once out of range
+            oldest = latest - min(self.max_poi_distance, self.primary_lookback)
+            for i in [i for i in candidates if i < oldest]:
+                del candidates[i]
+    
+    def current_order_blocks(self, direction: str = "bullish") -> List[PointOfInterest]:
+        """
+        Order blocks for the streamed candles.
+        
+        Matches detect_order_blocks on a frame of the same candles (timestamps
+        are None, as the stream keeps no index).
+        """
+        sign = {"bullish": 1, "bearish": -1}.get(direction, 0)
+        if sign == 0:
+            return []
+        
+        open_, high_, low_, close_ = self._stream_ohlc[:, :self._stream_length]
+        latest = self._stream_length - 1
+        
+        # Newest first: ascending distance to the latest candle
+        return [
+            PointOfInterest(
+                poi_type=POIType.ORDER_BLOCK,
+                price_high=high_[i],
+                price_low=low_[i],
+                candle_index=i,
+                body_high=max(open_[i], close_[i]),
+                body_low=min(open_[i], close_[i]),
+                triggered_structure=True,
+                has_inducement=False,
+                is_unmitigated=unmitigated,
+                distance_to_liquidity=self._calculate_distance_to_inducement(i, latest),
+                direction=direction,
+                timestamp=None
+            )
+            for i, unmitigated in sorted(self._stream_candidates[sign].items(), reverse=True)
+        ]
+    
+    def detect_order_blocks_incremental(self, direction: str = "bullish") -> List[PointOfInterest]:
+        """
+        Order blocks that appeared since the previous call for this direction.
+        
+        Returns:
+            New streamed order blocks (see current_order_blocks)
+        """
+        order_blocks = self.current_order_blocks(direction)
+        sign = 1 if direction == "bullish" else -1
+        
+        reported = self._stream_reported[sign]
+        new_blocks = [ob for ob in order_blocks if ob.candle_index not in reported]
+        self._stream_reported[sign] = {ob.candle_index for ob in order_blocks}
+        
+        return new_blocks
+    
+    def _find_order_blocks(
+        self,
+        df: pd.DataFrame,
+        arrays: _CandleArrays,
+        direction: str,
+        inducement_index: Optional[int],
+        structure_break_index: Optional[int]
+    ) -> List[PointOfInterest]:
+        """Order block scan behind detect_order_blocks / scan_all_pois."""
         order_blocks = []
         
         # Use structure_break_index if provided, else use end of data
@@ -114,88 +298,92 @@ class POIDetector:
             inducement_index = scan_end
         
         # CRITICAL FIX: Proper lookback window
-        start_index = max(0, scan_end - self.primary_lookback)
+        # Only candles within max_poi_distance of the inducement are kept, so
+        # start there when that is later than the lookback start. Every
+        # scanned candle then passes the distance rule; do not widen the
+        # window without restoring a distance check.
+        start_index = max(
+            0,
+            scan_end - self.primary_lookback,
+            inducement_index - self.max_poi_distance
+        )
         
         # Log for verification
         candles_scanned = scan_end - start_index
         
-        for i in range(start_index, scan_end):
-            is_bullish_candle = df['close'].iloc[i] > df['open'].iloc[i]
-            is_bearish_candle = df['close'].iloc[i] < df['open'].iloc[i]
+        open_, high_, low_, close_ = arrays.open_, arrays.high_, arrays.low_, arrays.close_
+        body_high, body_low = arrays.body_high, arrays.body_low
+        timestamps = arrays.timestamps
+        
+        # Candidates need three candles after them for the displacement check
+        scan_stop = max(start_index, min(scan_end, len(close_) - 3))
+        direction_sign = {"bullish": 1, "bearish": -1}.get(direction, 0)
+        
+        if direction_sign == 0:
+            candidates = np.zeros(0, dtype=np.int64)
+        elif NUMBA_AVAILABLE:
+            candidates = scan_order_blocks(
+                open_, high_, low_, close_, start_index, scan_stop, direction_sign
+            )
+        else:
+            next_bull_count, next_bear_count, next_range, prior_avg_range = (
+                self._displacement(arrays)
+            )
+            window = slice(start_index, scan_stop)
+            strong_displacement = next_range[window] > prior_avg_range[window] * 1.5
             
-            # For bullish OB: last bearish candle before displacement
-            if direction == "bullish" and is_bearish_candle:
-                if i + 3 < len(df):
-                    next_candles = df.iloc[i+1:min(i+4, len(df))]
-                    bullish_displacement = (next_candles['close'] > next_candles['open']).sum() >= 2
-                    
-                    displacement_range = next_candles['high'].max() - next_candles['low'].min()
-                    avg_range = df['high'].iloc[max(0, i-5):i].sub(df['low'].iloc[max(0, i-5):i]).mean() if i >= 5 else displacement_range
-                    
-                    if bullish_displacement and displacement_range > avg_range * 1.5:
-                        ob = PointOfInterest(
-                            poi_type=POIType.ORDER_BLOCK,
-                            price_high=df['high'].iloc[i],
-                            price_low=df['low'].iloc[i],
-                            candle_index=i,
-                            body_high=max(df['open'].iloc[i], df['close'].iloc[i]),
-                            body_low=min(df['open'].iloc[i], df['close'].iloc[i]),
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=self._check_mitigation_50_percent(df, i, inducement_index, direction),
-                            distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
-                            direction=direction,
-                            timestamp=df.index[i] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        
-                        candle_distance = inducement_index - i
-                        if candle_distance <= self.max_poi_distance:
-                            order_blocks.append(ob)
+            if direction_sign > 0:
+                # For bullish OB: last bearish candle before displacement
+                mask = (
+                    (close_[window] < open_[window]) &
+                    (next_bull_count[window] >= 2) &
+                    strong_displacement
+                )
+            else:
+                # For bearish OB: last bullish candle before displacement
+                mask = (
+                    (close_[window] > open_[window]) &
+                    (next_bear_count[window] >= 2) &
+                    strong_displacement
+                )
+            candidates = start_index + np.flatnonzero(mask)
+        
+        # Lowest low / highest high from each candle up to the inducement
+        seg_low_min, seg_high_max = self._forward_extremes(high_, low_, inducement_index)
+        
+        # Distance is inducement_index - i, so walking the ascending candidates
+        # backwards yields the blocks already sorted by proximity
+        for i in candidates[::-1].tolist():
+            ob = PointOfInterest(
+                poi_type=POIType.ORDER_BLOCK,
+                price_high=high_[i],
+                price_low=low_[i],
+                candle_index=i,
+                body_high=body_high[i],
+                body_low=body_low[i],
+                triggered_structure=True,
+                has_inducement=False,
+                is_unmitigated=self._check_mitigation_50_percent(
+                    high_, low_, seg_low_min, seg_high_max, i, inducement_index, direction
+                ),
+                distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
+                direction=direction,
+                timestamp=timestamps[i] if timestamps is not None else None
+            )
             
-            # For bearish OB: last bullish candle before displacement
-            elif direction == "bearish" and is_bullish_candle:
-                if i + 3 < len(df):
-                    next_candles = df.iloc[i+1:min(i+4, len(df))]
-                    bearish_displacement = (next_candles['close'] < next_candles['open']).sum() >= 2
-                    
-                    displacement_range = next_candles['high'].max() - next_candles['low'].min()
-                    avg_range = df['high'].iloc[max(0, i-5):i].sub(df['low'].iloc[max(0, i-5):i]).mean() if i >= 5 else displacement_range
-                    
-                    if bearish_displacement and displacement_range > avg_range * 1.5:
-                        ob = PointOfInterest(
-                            poi_type=POIType.ORDER_BLOCK,
-                            price_high=df['high'].iloc[i],
-                            price_low=df['low'].iloc[i],
-                            candle_index=i,
-                            body_high=max(df['open'].iloc[i], df['close'].iloc[i]),
-                            body_low=min(df['open'].iloc[i], df['close'].iloc[i]),
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=self._check_mitigation_50_percent(df, i, inducement_index, direction),
-                            distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
-                            direction=direction,
-                            timestamp=df.index[i] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        
-                        candle_distance = inducement_index - i
-                        if candle_distance <= self.max_poi_distance:
-                            order_blocks.append(ob)
-        
-        # Sort by proximity
-        order_blocks.sort(key=lambda x: x.distance_to_liquidity)
+            order_blocks.append(ob)
         
         return order_blocks
     
-    def detect_breaker_blocks(
+    def _find_breaker_blocks(
         self,
         df: pd.DataFrame,
-        direction: str = "bullish",
-        inducement_index: Optional[int] = None,
-        structure_break_index: Optional[int] = None
+        arrays: _CandleArrays,
+        direction: str,
+        inducement_index: Optional[int],
+        structure_break_index: Optional[int]
     ) -> List[PointOfInterest]:
-        """
-        Detect Breaker Blocks with CORRECT 200-candle lookback.
-        """
+        """Breaker block scan behind detect_breaker_blocks / scan_all_pois."""
         breaker_blocks = []
         
         if structure_break_index is not None:
@@ -206,91 +394,173 @@ class POIDetector:
         if inducement_index is None:
             inducement_index = scan_end
         
-        # CRITICAL FIX: Proper lookback
-        start_index = max(0, scan_end - self.primary_lookback)
+        # CRITICAL FIX: Proper lookback (narrowed to max_poi_distance, see _find_order_blocks)
+        start_index = max(
+            0,
+            scan_end - self.primary_lookback,
+            inducement_index - self.max_poi_distance
+        )
+        
+        open_, high_, low_, close_ = arrays.open_, arrays.high_, arrays.low_, arrays.close_
+        body_high, body_low = arrays.body_high, arrays.body_low
+        timestamps = arrays.timestamps
+        
+        # Candidates need three candles after them for the displacement check
+        scan_stop = max(start_index, min(scan_end, len(close_) - 3))
+        direction_sign = {"bullish": 1, "bearish": -1}.get(direction, 0)
         
-        for i in range(start_index, scan_end):
-            candle_high = df['high'].iloc[i]
-            candle_low = df['low'].iloc[i]
-            body_high = max(df['open'].iloc[i], df['close'].iloc[i])
-            body_low = min(df['open'].iloc[i], df['close'].iloc[i])
+        if direction_sign == 0:
+            candidates = np.zeros(0, dtype=np.int64)
+        elif NUMBA_AVAILABLE:
+            candidates = scan_breaker_blocks(
+                open_, high_, low_, close_, start_index, scan_stop, direction_sign
+            )
+        else:
+            next_bull_count, next_bear_count, _, _ = self._displacement(arrays)
+            window = slice(start_index, scan_stop)
+            following = slice(start_index + 1, scan_stop + 1)
+            
+            if direction_sign > 0:
+                # Next candle breaks below, followed by bearish displacement
+                mask = (low_[following] < low_[window]) & (next_bear_count[window] >= 2)
+            else:
+                # Next candle breaks above, followed by bullish displacement
+                mask = (high_[following] > high_[window]) & (next_bull_count[window] >= 2)
+            candidates = start_index + np.flatnonzero(mask)
+        
+        # Lowest low / highest high from each candle to the end of the data
+        fwd_low_min, fwd_high_max = self._full_forward_extremes(arrays)
+        
+        # Newest first: ascending distance to the inducement, as before
+        for i in candidates[::-1].tolist():
+            body_unmitigated = self._is_body_unmitigated(
+                body_high, body_low, fwd_low_min, fwd_high_max, i, direction
+            )
             
-            if i + 3 < len(df):
-                if direction == "bullish":
-                    broke_below = df['low'].iloc[i+1] < candle_low
-                    displacement_candles = df.iloc[i+1:min(i+4, len(df))]
-                    has_displacement = (displacement_candles['close'] < displacement_candles['open']).sum() >= 2
-                    body_unmitigated = self._is_body_unmitigated(df, i, direction)
-                    
-                    if broke_below and has_displacement and body_unmitigated:
-                        bb = PointOfInterest(
-                            poi_type=POIType.BREAKER_BLOCK,
-                            price_high=candle_high,
-                            price_low=candle_low,
-                            candle_index=i,
-                            body_high=body_high,
-                            body_low=body_low,
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=body_unmitigated,
-                            distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
-                            direction=direction,
-                            timestamp=df.index[i] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        
-                        candle_distance = inducement_index - i
-                        if candle_distance <= self.max_poi_distance:
-                            breaker_blocks.append(bb)
+            if body_unmitigated:
+                bb = PointOfInterest(
+                    poi_type=POIType.BREAKER_BLOCK,
+                    price_high=high_[i],
+                    price_low=low_[i],
+                    candle_index=i,
+                    body_high=body_high[i],
+                    body_low=body_low[i],
+                    triggered_structure=True,
+                    has_inducement=False,
+                    is_unmitigated=body_unmitigated,
+                    distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
+                    direction=direction,
+                    timestamp=timestamps[i] if timestamps is not None else None
+                )
                 
-                elif direction == "bearish":
-                    broke_above = df['high'].iloc[i+1] > candle_high
-                    displacement_candles = df.iloc[i+1:min(i+4, len(df))]
-                    has_displacement = (displacement_candles['close'] > displacement_candles['open']).sum() >= 2
-                    body_unmitigated = self._is_body_unmitigated(df, i, direction)
-                    
-                    if broke_above and has_displacement and body_unmitigated:
-                        bb = PointOfInterest(
-                            poi_type=POIType.BREAKER_BLOCK,
-                            price_high=candle_high,
-                            price_low=candle_low,
-                            candle_index=i,
-                            body_high=body_high,
-                            body_low=body_low,
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=body_unmitigated,
-                            distance_to_liquidity=self._calculate_distance_to_inducement(i, inducement_index),
-                            direction=direction,
-                            timestamp=df.index[i] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        
-                        candle_distance = inducement_index - i
-                        if candle_distance <= self.max_poi_distance:
-                            breaker_blocks.append(bb)
-        
-        breaker_blocks.sort(key=lambda x: x.distance_to_liquidity)
+                breaker_blocks.append(bb)
+        
         return breaker_blocks
     
-    # Helper methods remain the same...
-    def _check_mitigation_50_percent(self, df, poi_index, inducement_index, direction) -> bool:
-        """50% mean threshold mitigation check."""
+    @staticmethod
+    def _candle_arrays(df: pd.DataFrame) -> _CandleArrays:
+        """Open, high, low, close and candle bodies as float64 arrays (no per-candle pandas access)."""
+        open_ = df['open'].to_numpy(dtype=np.float64, copy=False)
+        close_ = df['close'].to_numpy(dtype=np.float64, copy=False)
+        
+        return _CandleArrays(
+            open_=open_,
+            high_=df['high'].to_numpy(dtype=np.float64, copy=False),
+            low_=df['low'].to_numpy(dtype=np.float64, copy=False),
+            close_=close_,
+            body_high=np.maximum(open_, close_),
+            body_low=np.minimum(open_, close_),
+            timestamps=df.index.to_numpy() if hasattr(df.index, 'to_timestamp') else None,
+        )
+    
+    def _full_forward_extremes(self, arrays: _CandleArrays) -> Tuple[np.ndarray, np.ndarray]:
+        """_forward_extremes to the last candle, computed once per _CandleArrays."""
+        if arrays.forward_extremes is None:
+            arrays.forward_extremes = self._forward_extremes(arrays.high_, arrays.low_)
+        return arrays.forward_extremes
+    
+    def _displacement(self, arrays: _CandleArrays) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """_displacement_features, computed once per _CandleArrays."""
+        if arrays.displacement is None:
+            arrays.displacement = self._displacement_features(
+                arrays.open_, arrays.high_, arrays.low_, arrays.close_
+            )
+        return arrays.displacement
+    
+    @staticmethod
+    def _displacement_features(
+        open_: np.ndarray,
+        high_: np.ndarray,
+        low_: np.ndarray,
+        close_: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-candle displacement inputs, computed for all candles at once.
+        
+        For candle i (where i + 3 < len), entries describe candles i+1..i+3:
+        bullish count, bearish count and high-low range. The fourth array
+        is the mean high-low range of candles i-5..i-1, or the displacement
+        range itself for i < 5. Entries without three following candles are 0.
+        """
+        n = len(close_)
+        next_bull_count = np.zeros(n, dtype=np.int64)
+        next_bear_count = np.zeros(n, dtype=np.int64)
+        next_range = np.zeros(n)
+        
+        if n >= 4:
+            # 3-candle counts as prefix-sum differences: window j covers
+            # candles j..j+2, and candle i uses window i+1
+            bull_prefix = np.concatenate(([0], np.cumsum(close_ > open_)))
+            bear_prefix = np.concatenate(([0], np.cumsum(close_ < open_)))
+            next_bull_count[:n-3] = (bull_prefix[3:] - bull_prefix[:-3])[1:]
+            next_bear_count[:n-3] = (bear_prefix[3:] - bear_prefix[:-3])[1:]
+            next_range[:n-3] = (
+                sliding_window_view(high_, 3).max(axis=1) -
+                sliding_window_view(low_, 3).min(axis=1)
+            )[1:]
+        
+        prior_avg_range = next_range.copy()
+        if n >= 6:
+            # Window j covers candles j..j+4; candle i uses window i-5
+            prior_avg_range[5:] = sliding_window_view(high_ - low_, 5).mean(axis=1)[:n-5]
+        
+        return next_bull_count, next_bear_count, next_range, prior_avg_range
+    
+    @staticmethod
+    def _forward_extremes(
+        high_: np.ndarray,
+        low_: np.ndarray,
+        end: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Running extremes towards the right, for O(1) mitigation checks.
+        
+        Entry k holds min(low_[k:end+1]) and max(high_[k:end+1]), with end
+        defaulting to the last candle. NaN candles are skipped, as the
+        comparisons in a candle-by-candle scan never trigger on them.
+        """
+        stop = len(low_) if end is None else end + 1
+        return (
+            np.fmin.accumulate(low_[:stop][::-1])[::-1],
+            np.fmax.accumulate(high_[:stop][::-1])[::-1],
+        )
+    
+    def _check_mitigation_50_percent(
+        self, high_, low_, seg_low_min, seg_high_max, poi_index, inducement_index, direction
+    ) -> bool:
+        """50% mean threshold mitigation check (extremes from _forward_extremes up to the inducement)."""
         if poi_index >= inducement_index:
             return True
         
-        poi_high = df['high'].iloc[poi_index]
-        poi_low = df['low'].iloc[poi_index]
+        poi_high = high_[poi_index]
+        poi_low = low_[poi_index]
         mean_threshold = (poi_high + poi_low) / 2
         
-        for i in range(poi_index + 1, inducement_index + 1):
-            candle_high = df['high'].iloc[i]
-            candle_low = df['low'].iloc[i]
-            
-            if direction == "bullish":
-                if candle_low <= mean_threshold:
-                    return False
-            elif direction == "bearish":
-                if candle_high >= mean_threshold:
-                    return False
+        # Mitigated once any candle up to the inducement reaches the mean
+        if direction == "bullish":
+            return not seg_low_min[poi_index + 1] <= mean_threshold
+        elif direction == "bearish":
+            return not seg_high_max[poi_index + 1] >= mean_threshold
         
         return True
     
@@ -298,93 +568,132 @@ class POIDetector:
         """Calculate candle distance from POI to Inducement."""
         return float(inducement_index - poi_index)
     
-    def _is_body_unmitigated(self, df, candle_index, direction) -> bool:
+    def _is_body_unmitigated(self, body_high, body_low, fwd_low_min, fwd_high_max, candle_index, direction) -> bool:
         """Check if POI body is unmitigated (for Breaker Blocks)."""
-        if candle_index >= len(df) - 1:
+        if candle_index >= len(body_low) - 1:
             return True
         
-        body_high = max(df['open'].iloc[candle_index], df['close'].iloc[candle_index])
-        body_low = min(df['open'].iloc[candle_index], df['close'].iloc[candle_index])
-        
-        for i in range(candle_index + 1, len(df)):
-            if direction == "bullish":
-                if df['low'].iloc[i] <= body_low:
-                    return False
-            elif direction == "bearish":
-                if df['high'].iloc[i] >= body_high:
-                    return False
+        if direction == "bullish":
+            return not fwd_low_min[candle_index + 1] <= body_low[candle_index]
+        elif direction == "bearish":
+            return not fwd_high_max[candle_index + 1] >= body_high[candle_index]
         
         return True
     
-    def detect_fair_value_gaps(self, df, direction) -> List[PointOfInterest]:
-        """Detect FVGs (unchanged - already correct)."""
+    def _find_fair_value_gaps(self, df, arrays: _CandleArrays, direction) -> List[PointOfInterest]:
+        """FVG scan behind detect_fair_value_gaps / scan_all_pois."""
         fvgs = []
         
-        for i in range(2, len(df)):
-            if direction == "bullish":
-                gap_bottom = df['high'].iloc[i-2]
-                gap_top = df['low'].iloc[i]
-                
-                if gap_top > gap_bottom:
-                    gap_size = gap_top - gap_bottom
-                    gap_percent = (gap_size / gap_bottom) * 100
-                    
-                    if gap_percent >= self.fvg_min_size_percent:
-                        fvg = PointOfInterest(
-                            poi_type=POIType.FAIR_VALUE_GAP,
-                            price_high=gap_top,
-                            price_low=gap_bottom,
-                            candle_index=i-1,
-                            body_high=gap_top,
-                            body_low=gap_bottom,
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=self._is_fvg_unmitigated(df, i, gap_bottom, gap_top),
-                            distance_to_liquidity=0.0,
-                            direction=direction,
-                            fvg_overlap=False,
-                            timestamp=df.index[i-1] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        fvgs.append(fvg)
+        high_, low_ = arrays.high_, arrays.low_
+        timestamps = arrays.timestamps
+        fwd_low_min, fwd_high_max = self._full_forward_extremes(arrays)
+        
+        # Gap k spans candles k..k+2 (FVG candle k+1); percent is relative to
+        # the first candle's edge
+        n = len(high_)
+        if direction == "bullish":
+            gap_bottoms = high_[:max(n - 2, 0)]
+            gap_tops = low_[2:]
+            reference = gap_bottoms
+        elif direction == "bearish":
+            gap_tops = low_[:max(n - 2, 0)]
+            gap_bottoms = high_[2:]
+            reference = gap_tops
+        else:
+            return fvgs
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            candidates = (gap_tops > gap_bottoms) & (
+                (gap_tops - gap_bottoms) / reference * 100 >= self.fvg_min_size_percent
+            )
+        
+        for k in np.flatnonzero(candidates).tolist():
+            i = k + 2
+            gap_top = gap_tops[k]
+            gap_bottom = gap_bottoms[k]
             
-            elif direction == "bearish":
-                gap_top = df['low'].iloc[i-2]
-                gap_bottom = df['high'].iloc[i]
-                
-                if gap_top > gap_bottom:
-                    gap_size = gap_top - gap_bottom
-                    gap_percent = (gap_size / gap_top) * 100
-                    
-                    if gap_percent >= self.fvg_min_size_percent:
-                        fvg = PointOfInterest(
-                            poi_type=POIType.FAIR_VALUE_GAP,
-                            price_high=gap_top,
-                            price_low=gap_bottom,
-                            candle_index=i-1,
-                            body_high=gap_top,
-                            body_low=gap_bottom,
-                            triggered_structure=True,
-                            has_inducement=False,
-                            is_unmitigated=self._is_fvg_unmitigated(df, i, gap_bottom, gap_top),
-                            distance_to_liquidity=0.0,
-                            direction=direction,
-                            fvg_overlap=False,
-                            timestamp=df.index[i-1] if hasattr(df.index, 'to_timestamp') else None
-                        )
-                        fvgs.append(fvg)
+            fvg = PointOfInterest(
+                poi_type=POIType.FAIR_VALUE_GAP,
+                price_high=gap_top,
+                price_low=gap_bottom,
+                candle_index=i-1,
+                body_high=gap_top,
+                body_low=gap_bottom,
+                triggered_structure=True,
+                has_inducement=False,
+                is_unmitigated=self._is_fvg_unmitigated(fwd_low_min, fwd_high_max, i, gap_bottom, gap_top),
+                distance_to_liquidity=0.0,
+                direction=direction,
+                fvg_overlap=False,
+                timestamp=timestamps[i-1] if timestamps is not None else None
+            )
+            fvgs.append(fvg)
         
         return fvgs
     
-    def _is_fvg_unmitigated(self, df, candle_index, gap_low, gap_high) -> bool:
+    def _is_fvg_unmitigated(self, fwd_low_min, fwd_high_max, candle_index, gap_low, gap_high) -> bool:
         """Check if FVG is unmitigated."""
-        if candle_index >= len(df) - 1:
+        if candle_index >= len(fwd_low_min) - 1:
             return True
         
-        for i in range(candle_index + 1, len(df)):
-            if df['low'].iloc[i] <= gap_low or df['high'].iloc[i] >= gap_high:
-                return False
+        return not (
+            fwd_low_min[candle_index + 1] <= gap_low or
+            fwd_high_max[candle_index + 1] >= gap_high
+        )
+
+
+def _scan_worker(timeframe: str, direction: str, columns: Dict[str, np.ndarray], index: pd.Index):
+    """Process-pool task: scan_all_pois on a frame rebuilt from its OHLC arrays."""
+    df = pd.DataFrame(columns, index=index)
+    return POIDetector(timeframe).scan_all_pois(df, direction)
+
+
+def scan_pois_multi(
+    frames: Dict[Tuple[str, str], pd.DataFrame],
+    direction: str = "bullish",
+    parallel: bool = True,
+    max_workers: Optional[int] = None
+) -> Dict[Tuple[str, str], Tuple[List[PointOfInterest], List[PointOfInterest], List[PointOfInterest]]]:
+    """
+    Run POIDetector.scan_all_pois for many symbols/timeframes at once.
+    
+    Each (symbol, timeframe) scan is independent and CPU-bound, so with
+    parallel=True they are spread over a process pool. Only the four OHLC
+    arrays and the index of each frame are sent to the workers.
+    
+    Args:
+        frames: (symbol, timeframe) -> OHLC DataFrame for that timeframe
+        direction: "bullish" or "bearish"
+        parallel: Use a process pool (falls back to serial if unavailable)
+        max_workers: Pool size (default: one per CPU)
         
-        return True
+    Returns:
+        (symbol, timeframe) -> (order_blocks, breaker_blocks, fair_value_gaps)
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(frames))
+    
+    if parallel and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    key: pool.submit(
+                        _scan_worker,
+                        key[1],
+                        direction,
+                        {col: df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close')},
+                        df.index
+                    )
+                    for key, df in frames.items()
+                }
+                return {key: future.result() for key, future in futures.items()}
+        except (OSError, RuntimeError):
+            # No usable process pool here (e.g. restricted sandbox); scan serially
+            pass
+    
+    return {
+        (symbol, timeframe): POIDetector(timeframe).scan_all_pois(df, direction)
+        for (symbol, timeframe), df in frames.items()
+    }
 
 
 if __name__ == "__main__":
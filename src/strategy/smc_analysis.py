@@ -110,20 +110,10 @@ class SMCAnalyzer:
         # Get complete market structure
         structure = self.structure_detector.analyze_market_structure(df_htf)
         
-        # Detect all POI types
+        # Detect all POI types in one scan
         direction_str = "bullish" if structure['trend'] == TrendDirection.BULLISH else "bearish"
         
-        order_blocks = self.poi_detector.detect_order_blocks(
-            df_htf,
-            direction=direction_str
-        )
-        
-        breaker_blocks = self.poi_detector.detect_breaker_blocks(
-            df_htf,
-            direction=direction_str
-        )
-        
-        fvgs = self.poi_detector.detect_fair_value_gaps(
+        order_blocks, breaker_blocks, fvgs = self.poi_detector.scan_all_pois(
             df_htf,
             direction=direction_str
         )
@@ -208,24 +198,13 @@ class SMCAnalyzer:
         """
         direction_str = "bullish" if structure_break.direction == TrendDirection.BULLISH else "bearish"
         
-        # Get ITF POIs
-        order_blocks = self.poi_detector.detect_order_blocks(
+        # Get ITF POIs (FVGs cover the whole frame, blocks end at the break)
+        order_blocks, breaker_blocks, fvgs = self.poi_detector.scan_all_pois(
             df_itf,
             direction=direction_str,
             structure_break_index=structure_break.break_index
         )
         
-        breaker_blocks = self.poi_detector.detect_breaker_blocks(
-            df_itf,
-            direction=direction_str,
-            structure_break_index=structure_break.break_index
-        )
-        
-        fvgs = self.poi_detector.detect_fair_value_gaps(
-            df_itf,
-            direction=direction_str
-        )
-        
         # Scenario A (MSS): Prioritize OB, fallback to BB
         if scenario == ScenarioType.REVERSAL_MSS:
             # 1. Look for Order Block first
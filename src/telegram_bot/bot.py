@@ -7,19 +7,23 @@ Location: src/telegram_bot/bot.py
 """
 
 import asyncio
-from telegram.ext import Application
-from sqlalchemy.orm import Session
+import signal
+from typing import Optional, TYPE_CHECKING
+from telegram.ext import AIORateLimiter, Application
+
+try:
+    import aiolimiter  # noqa: F401  (backs AIORateLimiter)
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
 
 from config.settings import settings
 from config.database import get_db_session, init_database
-from src.telegram_bot.handlers.user_commands import register_user_handlers
-from src.telegram_bot.handlers.admin_commands import register_admin_handlers
-from src.telegram_bot.handlers.account_commands import register_account_handlers
-from src.telegram_bot.handlers.trade_commands import register_trade_handlers
-from src.telegram_bot.handlers.button_handlers import register_button_handlers
-from src.telegram_bot.handlers.missing_commands import register_missing_handlers
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
 logger = get_logger("TelegramBot", settings.LOG_LEVEL, settings.LOG_FILE_PATH)
 
 
@@ -29,10 +33,13 @@ class TelegramBot:
     Can run independently from main.py
     """
     
-    def __init__(self, db_session: Session = None):
+    def __init__(self, db_session: "Session" = None):
         self.db_session = db_session or get_db_session()
         self.application = None
+        self.admin_handler = None
         self.logger = logger
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stopped = False
     
     def setup(self):
         """Setup bot with all handlers."""
@@ -41,15 +48,27 @@ class TelegramBot:
             raise ValueError("TELEGRAM_BOT_TOKEN not set in configuration")
         
         # Create application
-        self.application = Application.builder().token(
-            settings.TELEGRAM_BOT_TOKEN
-        ).build()
+        # Updates from different chats are handled concurrently
+        builder = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).concurrent_updates(True)
+        if AIOLIMITER_AVAILABLE:
+            # Pace outgoing calls to Telegram's flood limits instead of
+            # failing with RetryAfter under load
+            builder = builder.rate_limiter(AIORateLimiter(max_retries=2))
+        self.application = builder.build()
+        
+        # Handler modules pull in the whole command graph; load them only here
+        from src.telegram_bot.handlers.user_commands import register_user_handlers
+        from src.telegram_bot.handlers.admin_commands import register_admin_handlers
+        from src.telegram_bot.handlers.account_commands import register_account_handlers
+        from src.telegram_bot.handlers.trade_commands import register_trade_handlers
+        from src.telegram_bot.handlers.button_handlers import register_button_handlers
+        from src.telegram_bot.handlers.missing_commands import register_missing_handlers
         
         # Register all handlers
         self.logger.info("Registering command handlers...")
         
         register_user_handlers(self.application, self.db_session)
-        register_admin_handlers(self.application, self.db_session)
+        self.admin_handler = register_admin_handlers(self.application, self.db_session)
         register_account_handlers(self.application, self.db_session)
         register_trade_handlers(self.application, self.db_session)
         register_button_handlers(self.application, self.db_session)
@@ -74,16 +93,40 @@ class TelegramBot:
         
         self.logger.info("✓ Telegram bot is running")
         
-        # Keep running
+        # Keep running until SIGINT/SIGTERM (e.g. systemd or docker stop) or stop()
+        self._stopped = False
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        handled_signals = []
+        
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop_event.set)
+                handled_signals.append(sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows or not the main thread: Ctrl+C still raises KeyboardInterrupt
+                pass
+        
         try:
-            await asyncio.Event().wait()
+            await self._stop_event.wait()
+            self.logger.info("Shutdown signal received")
         except KeyboardInterrupt:
             self.logger.info("Shutdown signal received")
         finally:
+            for sig in handled_signals:
+                loop.remove_signal_handler(sig)
             await self.stop()
     
     async def stop(self):
-        """Stop the bot."""
+        """Stop the bot (safe to call more than once)."""
+        
+        # Wake start() if it is waiting; it calls back here, which is a no-op
+        if self._stop_event is not None:
+            self._stop_event.set()
+        
+        if self._stopped:
+            return
+        self._stopped = True
         
         self.logger.info("Stopping Telegram bot...")
         
@@ -92,6 +135,10 @@ class TelegramBot:
             await self.application.stop()
             await self.application.shutdown()
         
+        if self.admin_handler:
+            # Flush buffered audit rows before the session goes away
+            await self.admin_handler.close()
+        
         if self.db_session:
             self.db_session.close()
         
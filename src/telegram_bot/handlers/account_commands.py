@@ -1,53 +1,192 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
 from telegram import Update
 from telegram.ext import (
     ContextTypes, CommandHandler, CallbackQueryHandler,
     ConversationHandler, MessageHandler, filters
 )
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker, load_only
+from config.settings import settings as _default_settings
 from src.database.models import User, MT5Account, UserRole, AccountStatus  # FIXED: Added AccountStatus
 from src.core.account_manager import AccountManager
 from src.telegram_bot.keyboards import BotKeyboards
 from src.security.validator import InputValidator
+from src.security.encryption import get_encryptor
 
 ACCOUNT_NAME, MT5_LOGIN, MT5_PASSWORD, MT5_SERVER = range(4)
 
+_STATUS_TEXT = {
+    AccountStatus.ACTIVE: 'ACTIVE',
+    AccountStatus.INACTIVE: 'INACTIVE',
+    AccountStatus.PENDING: 'PENDING',
+    AccountStatus.ERROR: 'ERROR'
+}
+
+# MetaTrader5 drives one terminal session per process: initialize, login,
+# account_info and shutdown all act on it globally. MT5 calls therefore
+# run on this single thread - off the event loop, but never two at once,
+# so one user's connection test cannot read or tear down another's.
+MT5_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
+
+# /myaccounts lists at most this many accounts
+MY_ACCOUNTS_LIMIT = 50
+
+# chat_id -> (user_id, role, cached_at, account_ids); ids rather than ORM
+# objects so an entry never outlives the session that loaded it.
+# account_ids are the user's MT5Account ids in /myaccounts order, or None
+# until they have been looked up.
+USER_CACHE_TTL = 60
+_USER_CACHE: Dict[int, Tuple[int, UserRole, float, Optional[Tuple[int, ...]]]] = {}
+
+
+def invalidate_user(chat_id: int):
+    """Drop the cached user lookup for a chat (after /start or account changes)."""
+    _USER_CACHE.pop(chat_id, None)
+
 
 class AccountCommandHandler:
-    """Handles account management commands - FIXED VERSION"""
+    """
+    Handles account management commands - FIXED VERSION
+    
+    The session and AccountManager are synchronous, so every query and
+    MT5 call runs in a worker thread and the event loop keeps serving
+    other chats meanwhile. Queries use asyncio.to_thread; MT5 calls are
+    serialized on MT5_EXECUTOR because the terminal session is global.
+    Each call checks out its own short-lived session and connection (file
+    SQLite gets a fresh connection per session, see config.database), so
+    worker threads never share a Session or a transaction.
+    """
     
     def __init__(self, config, db_session: Session):
         self.config = config
-        self.db = db_session
-        self.validator = InputValidator()
+        # expire_on_commit=False keeps loaded rows readable after the
+        # session closes
+        self.Session = sessionmaker(bind=db_session.get_bind(), expire_on_commit=False)
         self.keyboards = BotKeyboards()
-        self.account_manager = AccountManager(config, db_session)
+        self.encryptor = get_encryptor()
+        self._user_cache = _USER_CACHE
+        self._mt5_executor = MT5_EXECUTOR
+    
+    async def _get_user(self, chat_id: int) -> Optional[Tuple[int, UserRole]]:
+        """
+        (user_id, role) for a chat, cached for USER_CACHE_TTL seconds.
+        
+        Returns None for unknown chats; misses are not cached so a user
+        who has just run /start is found on the next update.
+        """
+        entry = self._user_cache.get(chat_id)
+        now = monotonic()
+        if entry is not None and now - entry[2] < USER_CACHE_TTL:
+            return entry[0], entry[1]
+        
+        user = await asyncio.to_thread(self._load_user, chat_id)
+        if user is None:
+            self._user_cache.pop(chat_id, None)
+            return None
+        
+        self._user_cache[chat_id] = (user[0], user[1], now, None)
+        return user
+    
+    def _cached_account_ids(self, chat_id: int) -> Optional[Tuple[int, ...]]:
+        """Cached account ids for a chat, or None if absent or expired."""
+        entry = self._user_cache.get(chat_id)
+        if entry is None or monotonic() - entry[2] >= USER_CACHE_TTL:
+            return None
+        return entry[3]
+    
+    def _remember_account_ids(self, chat_id: int, account_ids: Tuple[int, ...]):
+        """Attach account ids to a chat's entry; it keeps its original expiry."""
+        entry = self._user_cache.get(chat_id)
+        if entry is not None:
+            self._user_cache[chat_id] = (entry[0], entry[1], entry[2], account_ids)
+    
+    async def _run_mt5(self, fn, *args):
+        """Run a blocking MT5 call on the serialized MT5 thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._mt5_executor, fn, *args)
+    
+    # Blocking queries, run through asyncio.to_thread by the handlers
+    
+    def _load_user(self, chat_id: int) -> Optional[Tuple[int, UserRole]]:
+        # Two columns, not a User entity: nothing enters the identity map
+        with self.Session() as db:
+            row = db.execute(
+                select(User.id, User.role).where(User.telegram_chat_id == chat_id)
+            ).first()
+            return (row.id, row.role) if row else None
+    
+    def _count_active_accounts(self, user_id: int, limit: int) -> int:
+        # Only whether the limit is reached matters, so fetch at most
+        # limit ids instead of counting every active row
+        with self.Session() as db:
+            return len(db.query(MT5Account.id).filter_by(
+                user_id=user_id,
+                status=AccountStatus.ACTIVE  # ✅ FIXED
+            ).limit(limit).all())
+    
+    def _list_accounts(self, user_id: int, limit: int):
+        # (account, last_error[:50]) rows with only the columns the listing
+        # shows; numbered in id order, the same order /testconnection uses
+        with self.Session() as db:
+            return db.query(
+                MT5Account, func.substr(MT5Account.last_error, 1, 50)
+            ).options(load_only(
+                MT5Account.account_name, MT5Account.mt5_login, MT5Account.mt5_server,
+                MT5Account.account_currency, MT5Account.account_balance,
+                MT5Account.auto_trade_enabled, MT5Account.status,
+                MT5Account.last_connected
+            )).filter_by(user_id=user_id).order_by(MT5Account.id).limit(limit).all()
+    
+    def _account_ids(self, user_id: int) -> Tuple[int, ...]:
+        with self.Session() as db:
+            return tuple(
+                account_id for (account_id,) in
+                db.query(MT5Account.id).filter_by(user_id=user_id).order_by(MT5Account.id)
+            )
+    
+    def _get_account(self, account_id: int) -> Optional[MT5Account]:
+        with self.Session() as db:
+            return db.get(MT5Account, account_id)
+    
+    def _add_account(self, **fields) -> Optional[MT5Account]:
+        with self.Session() as db:
+            return AccountManager(self.config, db).add_account(**fields)
+    
+    def _test_connection(self, account_id: int) -> Optional[Dict[str, Any]]:
+        # The refreshed fields on success, None on failure
+        with self.Session() as db:
+            return AccountManager(self.config, db).test_connection(account_id)
     
     async def add_account_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start account addition conversation"""
+        message = update.message
+        
         try:
             chat_id = update.effective_chat.id
             
-            user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            user = await self._get_user(chat_id)
             if not user:
-                await update.message.reply_text("Please use /start first.")
+                await message.reply_text("Please use /start first.")
                 return ConversationHandler.END
+            user_id, user_role = user
             
-            # FIXED: Use AccountStatus Enum
-            existing_count = self.db.query(MT5Account).filter_by(
-                user_id=user.id,
-                status=AccountStatus.ACTIVE  # ✅ FIXED
-            ).count()
+            max_accounts = 999 if user_role == UserRole.ADMIN else 5
             
-            max_accounts = 999 if user.role == UserRole.ADMIN else 5
+            # FIXED: Use AccountStatus Enum
+            existing_count = await asyncio.to_thread(self._count_active_accounts, user_id, max_accounts)
             
             if existing_count >= max_accounts:
-                await update.message.reply_text(
+                await message.reply_text(
                     f"You have reached the maximum of {max_accounts} accounts.\n"
                     "Remove an account first or contact admin."
                 )
                 return ConversationHandler.END
             
-            await update.message.reply_text(
+            await message.reply_text(
                 "Let's add your MT5 account!\n\n"
                 "Step 1/4: Enter a friendly name for this account (e.g., 'Main Account', 'Demo 1')\n\n"
                 "Send /cancel to abort."
@@ -56,16 +195,18 @@ class AccountCommandHandler:
             return ACCOUNT_NAME
         
         except Exception as e:
-            await update.message.reply_text(f"Error: {str(e)}")
+            await message.reply_text(f"Error: {str(e)}")
             return ConversationHandler.END
     
     async def account_name_received(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process account name"""
+        message = update.message
+        
         try:
-            account_name = self.validator.validate_account_name(update.message.text)
+            account_name = InputValidator.validate_account_name(message.text)
             context.user_data['account_name'] = account_name
             
-            await update.message.reply_text(
+            await message.reply_text(
                 f"Great! Account name: {account_name}\n\n"
                 "Step 2/4: Enter your MT5 account LOGIN number\n"
                 "(This is your account number, usually 6-9 digits)"
@@ -74,7 +215,7 @@ class AccountCommandHandler:
             return MT5_LOGIN
         
         except ValueError as e:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"Invalid account name: {str(e)}\n\n"
                 "Please enter a valid account name (3-50 characters, alphanumeric only):"
             )
@@ -82,11 +223,13 @@ class AccountCommandHandler:
     
     async def mt5_login_received(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process MT5 login"""
+        message = update.message
+        
         try:
-            mt5_login = self.validator.validate_mt5_login(update.message.text)
+            mt5_login = InputValidator.validate_mt5_login(message.text)
             context.user_data['mt5_login'] = mt5_login
             
-            await update.message.delete()
+            await message.delete()
             
             await update.effective_chat.send_message(
                 f"Login number saved: {mt5_login}\n\n"
@@ -98,7 +241,7 @@ class AccountCommandHandler:
             return MT5_PASSWORD
         
         except ValueError as e:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"Invalid login: {str(e)}\n\n"
                 "Please enter your MT5 login number (numbers only):"
             )
@@ -106,21 +249,27 @@ class AccountCommandHandler:
     
     async def mt5_password_received(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process MT5 password"""
+        chat = update.effective_chat
+        message = update.message
+        
         try:
-            password = update.message.text.strip()
+            password = message.text.strip()
             
             if len(password) < 4:
-                await update.message.delete()
-                await update.effective_chat.send_message(
+                await message.delete()
+                await chat.send_message(
                     "Password too short. Please enter your MT5 password:"
                 )
                 return MT5_PASSWORD
             
-            context.user_data['mt5_password'] = password
+            # Only the ciphertext goes into user_data, so the plaintext never
+            # reaches conversation state (or persistence, if enabled)
+            context.user_data['mt5_password_enc'] = self.encryptor.encrypt(password)
+            del password
             
-            await update.message.delete()
+            await message.delete()
             
-            await update.effective_chat.send_message(
+            await chat.send_message(
                 "Password saved securely.\n\n"
                 "Step 4/4: Enter your MT5 SERVER name\n"
                 "(e.g., 'ICMarkets-Demo', 'Exness-Real', etc.)\n\n"
@@ -130,41 +279,54 @@ class AccountCommandHandler:
             return MT5_SERVER
         
         except Exception as e:
-            await update.message.delete()
-            await update.effective_chat.send_message(
+            await message.delete()
+            await chat.send_message(
                 f"Error: {str(e)}\n\nPlease enter your password again:"
             )
             return MT5_PASSWORD
     
     async def mt5_server_received(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Process MT5 server and create account"""
+        message = update.message
+        user_data = context.user_data
+        
         try:
-            server = self.validator.sanitize_string(update.message.text, max_length=100)
+            server = InputValidator.sanitize_string(message.text, max_length=100)
             
             chat_id = update.effective_chat.id
-            user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            user = await self._get_user(chat_id)
+            if not user:
+                await message.reply_text("Please use /start first.")
+                return ConversationHandler.END
+            user_id = user[0]
             
-            account_name = context.user_data['account_name']
-            mt5_login = context.user_data['mt5_login']
-            mt5_password = context.user_data['mt5_password']
+            account_name = user_data['account_name']
+            mt5_login = user_data['mt5_login']
+            encrypted_password = user_data['mt5_password_enc']
             
-            await update.message.reply_text(
+            # Replaced in place by the result below
+            status_msg = await message.reply_text(
                 "Creating account and testing connection...\n"
                 "This may take a few seconds."
             )
             
-            account = self.account_manager.add_account(
-                user_id=user.id,
-                account_name=account_name,
-                mt5_login=mt5_login,
-                mt5_password=mt5_password,
-                mt5_server=server
+            account = await self._run_mt5(
+                functools.partial(
+                    self._add_account,
+                    user_id=user_id,
+                    account_name=account_name,
+                    mt5_login=mt5_login,
+                    mt5_password=None,
+                    mt5_server=server,
+                    encrypted_password=encrypted_password
+                )
             )
             
-            del context.user_data['mt5_password']
+            del user_data['mt5_password_enc']
+            invalidate_user(chat_id)
             
             if account and account.status == AccountStatus.ACTIVE:  # FIXED
-                await update.message.reply_text(
+                await status_msg.edit_text(
                     f"SUCCESS! Account added and connection verified.\n\n"
                     f"Account Name: {account_name}\n"
                     f"Login: {mt5_login}\n"
@@ -176,21 +338,21 @@ class AccountCommandHandler:
                     f"Use /myaccounts to manage all your accounts."
                 )
             elif account:
-                await update.message.reply_text(
+                await status_msg.edit_text(
                     f"Account created but connection test FAILED.\n\n"
                     f"Error: {account.last_error or 'Unknown error'}\n\n"
                     f"Please verify your credentials and try again.\n"
                     f"Make sure MT5 terminal is running and the server is correct."
                 )
             else:
-                await update.message.reply_text(
+                await status_msg.edit_text(
                     "Failed to create account. Please try again or contact support."
                 )
             
             return ConversationHandler.END
         
         except Exception as e:
-            await update.message.reply_text(
+            await message.reply_text(
                 f"Error creating account: {str(e)}\n\n"
                 "Please try /addaccount again."
             )
@@ -198,8 +360,10 @@ class AccountCommandHandler:
     
     async def cancel_add_account(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel account addition"""
-        if 'mt5_password' in context.user_data:
-            del context.user_data['mt5_password']
+        user_data = context.user_data
+        
+        if 'mt5_password_enc' in user_data:
+            del user_data['mt5_password_enc']
         
         await update.message.reply_text(
             "Account addition cancelled.\n\n"
@@ -209,70 +373,86 @@ class AccountCommandHandler:
     
     async def my_accounts_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """List user's MT5 accounts"""
+        message = update.message
+        
         try:
             chat_id = update.effective_chat.id
-            user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            user = await self._get_user(chat_id)
             
             if not user:
-                await update.message.reply_text("Please use /start first.")
+                await message.reply_text("Please use /start first.")
                 return
+            user_id = user[0]
             
-            accounts = self.db.query(MT5Account).filter_by(user_id=user.id).all()
+            # One extra row tells whether the list was cut off
+            accounts = await asyncio.to_thread(self._list_accounts, user_id, MY_ACCOUNTS_LIMIT + 1)
             
             if not accounts:
-                await update.message.reply_text(
+                await message.reply_text(
                     "You don't have any MT5 accounts yet.\n\n"
                     "Use /addaccount to add your first account."
                 )
                 return
             
-            msg = "YOUR MT5 ACCOUNTS:\n\n"
+            # A complete listing also answers /testconnection's lookups
+            if len(accounts) <= MY_ACCOUNTS_LIMIT:
+                self._remember_account_ids(chat_id, tuple(account.id for account, _ in accounts))
+            
+            # One string per account, joined once (blank line between entries)
+            parts = ["YOUR MT5 ACCOUNTS:\n"]
             
-            for idx, account in enumerate(accounts, 1):
-                status_text = {
-                    AccountStatus.ACTIVE: 'ACTIVE',
-                    AccountStatus.INACTIVE: 'INACTIVE',
-                    AccountStatus.PENDING: 'PENDING',
-                    AccountStatus.ERROR: 'ERROR'
-                }.get(account.status, 'UNKNOWN')  # FIXED
+            for idx, (account, last_error) in enumerate(accounts[:MY_ACCOUNTS_LIMIT], 1):
+                status_text = _STATUS_TEXT.get(account.status, 'UNKNOWN')  # FIXED
                 
                 auto_trade_status = 'ENABLED' if account.auto_trade_enabled else 'DISABLED'
+                last_connected = account.last_connected.strftime('%Y-%m-%d %H:%M') if account.last_connected else 'Never'
                 
-                msg += f"{idx}. {account.account_name}\n"
-                msg += f"   Login: {account.mt5_login}\n"
-                msg += f"   Server: {account.mt5_server}\n"
-                msg += f"   Currency: {account.account_currency}\n"
-                msg += f"   Balance: {account.account_balance:.2f}\n"
-                msg += f"   Auto-Trade: {auto_trade_status}\n"
-                msg += f"   Status: {status_text}\n"
-                msg += f"   Last Connected: {account.last_connected.strftime('%Y-%m-%d %H:%M') if account.last_connected else 'Never'}\n"
+                entry = (
+                    f"{idx}. {account.account_name}\n"
+                    f"   Login: {account.mt5_login}\n"
+                    f"   Server: {account.mt5_server}\n"
+                    f"   Currency: {account.account_currency}\n"
+                    f"   Balance: {account.account_balance:.2f}\n"
+                    f"   Auto-Trade: {auto_trade_status}\n"
+                    f"   Status: {status_text}\n"
+                    f"   Last Connected: {last_connected}\n"
+                )
                 
                 if account.status == AccountStatus.ERROR:  # FIXED
-                    msg += f"   Error: {account.last_error[:50]}...\n"
+                    entry += f"   Error: {last_error}...\n"
                 
-                msg += "\n"
+                parts.append(entry)
+            
+            if len(accounts) > MY_ACCOUNTS_LIMIT:
+                parts.append(f"Showing your first {MY_ACCOUNTS_LIMIT} accounts.\n")
             
-            msg += "Use /testconnection <account_number> to test connection\n"
-            msg += "Use /removeaccount <account_number> to remove an account"
+            parts.append(
+                "Use /testconnection <account_number> to test connection\n"
+                "Use /removeaccount <account_number> to remove an account"
+            )
+            msg = "\n".join(parts)
             
-            await update.message.reply_text(msg)
+            await message.reply_text(msg)
         
         except Exception as e:
-            await update.message.reply_text(f"Error: {str(e)}")
+            await message.reply_text(f"Error: {str(e)}")
     
     async def test_connection_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Test MT5 connection for an account - FIXED"""
+        message = update.message
+        
         try:
             chat_id = update.effective_chat.id
-            user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            user = await self._get_user(chat_id)
             
             if not user:
-                await update.message.reply_text("Please use /start first.")
+                await message.reply_text("Please use /start first.")
                 return
+            user_id = user[0]
             
             # FIXED: Validate input properly
             if not context.args:
-                await update.message.reply_text(
+                await message.reply_text(
                     "Usage: /testconnection <account_number>\n\n"
                     "Example: /testconnection 1\n\n"
                     "Use /myaccounts to see your account numbers."
@@ -283,43 +463,57 @@ class AccountCommandHandler:
             try:
                 account_number = int(context.args[0])
             except ValueError:
-                await update.message.reply_text(
+                await message.reply_text(
                     "Invalid account number. Please use a number.\n\n"
                     "Example: /testconnection 1\n\n"
                     "Use /myaccounts to see your accounts."
                 )
                 return
             
-            # FIXED: Get accounts and validate index
-            accounts = self.db.query(MT5Account).filter_by(user_id=user.id).all()
+            # FIXED: Look up the account ids (cached by /myaccounts) and validate index
+            account_ids = self._cached_account_ids(chat_id)
+            if account_ids is None:
+                account_ids = await asyncio.to_thread(self._account_ids, user_id)
+                self._remember_account_ids(chat_id, account_ids)
+            total_accounts = len(account_ids)
             
-            if not accounts:
-                await update.message.reply_text("You don't have any accounts. Use /addaccount to add one.")
+            if not total_accounts:
+                await message.reply_text("You don't have any accounts. Use /addaccount to add one.")
                 return
             
             # FIXED: Proper bounds checking
-            if account_number < 1 or account_number > len(accounts):
-                await update.message.reply_text(
-                    f"Invalid account number. You have {len(accounts)} account(s).\n\n"
-                    f"Valid numbers: 1 to {len(accounts)}\n\n"
+            if account_number < 1 or account_number > total_accounts:
+                await message.reply_text(
+                    f"Invalid account number. You have {total_accounts} account(s).\n\n"
+                    f"Valid numbers: 1 to {total_accounts}\n\n"
                     "Use /myaccounts to see your accounts."
                 )
                 return
             
-            # FIXED: Correct indexing (user enters 1-based, array is 0-based)
-            account = accounts[account_number - 1]
+            # FIXED: Correct indexing (user enters 1-based, tuple is 0-based)
+            account = await asyncio.to_thread(self._get_account, account_ids[account_number - 1])
+            
+            if account is None:
+                # Removed since the ids were cached
+                invalidate_user(chat_id)
+                await message.reply_text("Account not found. Use /myaccounts to see your accounts.")
+                return
             
-            await update.message.reply_text(
+            # Replaced in place by the result below
+            status_msg = await message.reply_text(
                 f"Testing connection to {account.account_name}...\n"
                 "Please wait..."
             )
             
-            success = self.account_manager.test_connection(account.id)
+            updated = await self._run_mt5(self._test_connection, account.id)
             
-            if success:
-                self.db.refresh(account)
+            if updated is not None:
+                # Overlay the fresh values on the detached row instead of
+                # re-reading it
+                for field, value in updated.items():
+                    setattr(account, field, value)
                 
-                await update.message.reply_text(
+                await status_msg.edit_text(
                     f"CONNECTION SUCCESSFUL\n\n"
                     f"Account: {account.account_name}\n"
                     f"Login: {account.mt5_login}\n"
@@ -331,7 +525,7 @@ class AccountCommandHandler:
                     f"Status: ACTIVE"
                 )
             else:
-                await update.message.reply_text(
+                await status_msg.edit_text(
                     f"CONNECTION FAILED\n\n"
                     f"Account: {account.account_name}\n"
                     f"Login: {account.mt5_login}\n"
@@ -345,22 +539,26 @@ class AccountCommandHandler:
                 )
         
         except Exception as e:
-            await update.message.reply_text(f"Error: {str(e)}")
+            await message.reply_text(f"Error: {str(e)}")
 
 
-def register_account_handlers(application, db_session: Session):
-    """Register all account management handlers"""
-    from config.settings import settings
-    
+def register_account_handlers(application, db_session: Session, settings=_default_settings):
+    """Register all account management handlers (settings defaults to the global config)"""
     handler = AccountCommandHandler(settings, db_session)
     
+    # Plain text replies in every step; one composite filter shared by all
+    text_filter = filters.TEXT & ~filters.COMMAND
+    
+    # State steps run non-blocking so other updates are not held up behind
+    # them; the entry point stays blocking so the conversation is open
+    # before the next message arrives
     conv_handler = ConversationHandler(
         entry_points=[CommandHandler('addaccount', handler.add_account_start)],
         states={
-            ACCOUNT_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.account_name_received)],
-            MT5_LOGIN: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.mt5_login_received)],
-            MT5_PASSWORD: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.mt5_password_received)],
-            MT5_SERVER: [MessageHandler(filters.TEXT & ~filters.COMMAND, handler.mt5_server_received)],
+            ACCOUNT_NAME: [MessageHandler(text_filter, handler.account_name_received, block=False)],
+            MT5_LOGIN: [MessageHandler(text_filter, handler.mt5_login_received, block=False)],
+            MT5_PASSWORD: [MessageHandler(text_filter, handler.mt5_password_received, block=False)],
+            MT5_SERVER: [MessageHandler(text_filter, handler.mt5_server_received, block=False)],
         },
         fallbacks=[CommandHandler('cancel', handler.cancel_add_account)]
     )
@@ -5,15 +5,58 @@ Comprehensive admin functionality with security and audit logging
 Author: BLESSING OMOREGIE (Enhanced by Elite QDev Team)
 """
 
+import asyncio
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
-from sqlalchemy.orm import Session
-from src.database.models import User, MT5Account, Trade, UserRole, AuditLog
+from sqlalchemy import and_, case, func, select, text, tuple_
+from sqlalchemy.orm import Session, aliased, sessionmaker
+from config.settings import settings
+from src.data.mt5_connector import MT5Connector
+from src.database.models import User, MT5Account, Trade, UserRole, AccountStatus, AuditLog
+from src.telegram_bot.handlers.account_commands import MT5_EXECUTOR
 from src.security.validator import InputValidator, RateLimiter
 from datetime import datetime, timedelta
-from typing import Dict, List
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+from aiolimiter import AsyncLimiter
 import json
 
+# Seconds an admin-role lookup is reused before hitting the database again
+ADMIN_CACHE_TTL = 60
+
+# Audit rows are committed in batches of up to this many, at least once a second
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0
+_AUDIT_STOP = object()
+
+# Telegram allows about 30 messages per second across all chats
+BROADCAST_RATE = 30
+BROADCAST_CHUNK_SIZE = 500
+
+# Seconds a /stats or /health MT5 probe result is reused
+MT5_STATUS_TTL = 10
+
+# Seconds the /stats aggregates are served from memory before being recomputed
+STATS_SNAPSHOT_TTL = 30
+
+# Seconds psutil readings are reused between /health calls
+SYSTEM_USAGE_TTL = 2
+_sys_cache = {'t': None, 'mem': 0.0, 'cpu': 0.0}
+
+
+def _system_usage() -> Tuple[float, float]:
+    """Return (memory_percent, cpu_percent), refreshed at most every SYSTEM_USAGE_TTL."""
+    now = monotonic()
+    if _sys_cache['t'] is None or now - _sys_cache['t'] > SYSTEM_USAGE_TTL:
+        import psutil
+        # interval=None never sleeps; it reports usage since the previous call
+        _sys_cache.update(
+            t=now,
+            mem=psutil.virtual_memory().percent,
+            cpu=psutil.cpu_percent(interval=None)
+        )
+    return _sys_cache['mem'], _sys_cache['cpu']
+
 
 class AdminCommandHandler:
     """
@@ -23,37 +66,83 @@ class AdminCommandHandler:
     - Rate limiting
     - Input validation
     - Error handling
+    
+    The session is synchronous, so every query runs in a worker thread via
+    asyncio.to_thread and the event loop keeps serving other chats. Each
+    call checks out its own short-lived session from the engine's pool, so
+    worker threads never share a Session.
     """
     
-    def __init__(self, db_session: Session):
-        self.db = db_session
+    # /users row markers
+    _ROLE_BADGE = {
+        UserRole.ADMIN: '[ADMIN]',
+        UserRole.USER: '[USER]',
+        UserRole.BANNED: '[BANNED]'
+    }
+    _STATUS_ICON = {True: '🟢', False: '🔴'}
+    
+    # /health wording for the statuses reported by _probe_mt5
+    _MT5_HEALTH_LABEL = {'CONNECTED': 'OK', 'DISCONNECTED': 'FAILED'}
+    
+    def __init__(self, db_session: Session, mt5_connector=None):
+        # Sessions run concurrently in worker threads (audit flushes, bans,
+        # page reads); each gets its own connection, so one thread's commit
+        # or rollback never touches another's transaction (see
+        # config.database for SQLite). expire_on_commit=False keeps loaded
+        # rows readable after the session closes
+        self.Session = sessionmaker(bind=db_session.get_bind(), expire_on_commit=False)
         self.validator = InputValidator()
         self.rate_limiter = RateLimiter(max_calls=50, time_window=60)
+        # chat_id -> (is_admin, user_id, expires_at)
+        self._admin_cache: Dict[int, Tuple[bool, int, float]] = {}
+        # Audit rows are buffered and committed in batches by _audit_flusher
+        self._audit_queue: asyncio.Queue = asyncio.Queue()
+        self._audit_task: Optional[asyncio.Task] = None
+        # Shared by all broadcasts so they stay under Telegram's global send limit
+        self._broadcast_limiter = AsyncLimiter(BROADCAST_RATE, 1)
+        # Long-lived connector (created on first use if not injected; close()
+        # disconnects one it created) and the last probe result as
+        # (status, error, expires_at)
+        self._mt5 = mt5_connector
+        self._owns_mt5 = mt5_connector is None
+        self._mt5_status_cache: Optional[Tuple[str, str, float]] = None
+        # Last /stats aggregates as (generated_at, counts, expires_at)
+        self._stats_snapshot: Optional[Tuple[datetime, tuple, float]] = None
     
-    def _check_admin(self, chat_id: int) -> tuple[bool, User]:
+    async def _check_admin(self, chat_id: int) -> tuple[bool, Optional[int]]:
         """
         Check if user has admin privileges.
         
+        Results are cached per chat for ADMIN_CACHE_TTL seconds; ban and
+        unban drop the target's entry.
+        
         Returns:
-            Tuple of (is_admin, user_object)
+            Tuple of (is_admin, user_id)
         """
         try:
-            user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
-            
-            if not user:
-                return False, None
+            cached = self._admin_cache.get(chat_id)
+            if cached and monotonic() < cached[2]:
+                is_admin, user_id = cached[0], cached[1]
+            else:
+                row = await asyncio.to_thread(self._load_role, chat_id)
+                
+                if not row:
+                    return False, None
+                
+                is_admin, user_id = row.role == UserRole.ADMIN, row.id
+                self._admin_cache[chat_id] = (is_admin, user_id, monotonic() + ADMIN_CACHE_TTL)
             
-            if user.role != UserRole.ADMIN:
+            if not is_admin:
                 # Log unauthorized access attempt
                 self._log_audit(
-                    user_id=user.id,
+                    user_id=user_id,
                     action="UNAUTHORIZED_ADMIN_ACCESS",
                     success=False,
                     details="Non-admin user attempted admin command"
                 )
-                return False, user
+                return False, user_id
             
-            return True, user
+            return True, user_id
         except Exception as e:
             return False, None
     
@@ -66,21 +155,273 @@ class AdminCommandHandler:
         details: str = None,
         success: bool = True
     ):
-        """Log admin action for audit trail."""
+        """Queue admin action for the audit trail (written in batches)."""
+        row = {
+            'user_id': user_id,
+            'action': action,
+            'resource_type': resource_type,
+            'resource_id': resource_id,
+            'details': details,
+            'success': success,
+            'timestamp': datetime.utcnow()
+        }
+        
         try:
-            audit_log = AuditLog(
-                user_id=user_id,
-                action=action,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                details=details,
-                success=success,
-                timestamp=datetime.utcnow()
-            )
-            self.db.add(audit_log)
-            self.db.commit()
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): write straight through
+            self._write_audit([row])
+            return
+        
+        if self._audit_task is None or self._audit_task.done():
+            self._audit_task = loop.create_task(self._audit_flusher())
+        self._audit_queue.put_nowait(row)
+    
+    def _write_audit(self, rows: List[Dict]):
+        """Insert a batch of audit rows with a single commit."""
+        with self.Session() as db:
+            try:
+                db.bulk_insert_mappings(AuditLog, rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Audit logging failed: {e}")
+    
+    async def _audit_flusher(self):
+        """Drain the audit queue, committing up to AUDIT_BATCH_SIZE rows per second."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            item = await self._audit_queue.get()
+            rows = []
+            deadline = loop.time() + AUDIT_FLUSH_INTERVAL
+            
+            while item is not _AUDIT_STOP:
+                rows.append(item)
+                remaining = deadline - loop.time()
+                if len(rows) >= AUDIT_BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._audit_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            
+            if rows:
+                # The commit runs in a worker thread so it never stalls handlers
+                await asyncio.to_thread(self._write_audit, rows)
+            
+            if item is _AUDIT_STOP:
+                return
+    
+    async def close(self):
+        """Flush queued audit rows, stop the background writer and disconnect MT5."""
+        if self._audit_task is not None and not self._audit_task.done():
+            self._audit_queue.put_nowait(_AUDIT_STOP)
+            await self._audit_task
+        self._audit_task = None
+        
+        if self._mt5 is not None and self._owns_mt5:
+            # The MT5 session is process-global, so shut it down on its thread
+            await asyncio.get_running_loop().run_in_executor(MT5_EXECUTOR, self._mt5.disconnect)
+            self._mt5 = None
+            self._mt5_status_cache = None
+    
+    def _probe_mt5(self) -> Tuple[str, str]:
+        """
+        Ping MT5 through the shared connector, reconnecting if needed.
+        
+        Returns:
+            Tuple of (CONNECTED | DISCONNECTED | ERROR, error_text)
+        """
+        try:
+            if self._mt5 is None:
+                self._mt5 = MT5Connector(settings)
+            
+            if self._mt5.check_connection() or self._mt5.connect():
+                return "CONNECTED", ""
+            return "DISCONNECTED", ""
+        except Exception as e:
+            return "ERROR", str(e)[:50]
+    
+    # Blocking queries, run through asyncio.to_thread by the handlers
+    
+    def _load_role(self, chat_id: int):
+        with self.Session() as db:
+            return db.query(User.id, User.role).filter_by(telegram_chat_id=chat_id).first()
+    
+    def _ping_db(self) -> str:
+        """Database status line for /health."""
+        try:
+            # Round-trip only; no table read or ORM object
+            with self.Session() as db:
+                db.execute(text("SELECT 1")).scalar()
+            return "OK"
         except Exception as e:
-            print(f"Audit logging failed: {e}")
+            return f"ERROR - {str(e)[:50]}"
+    
+    def _stats_counts(self, today_start: datetime):
+        """(user, account, trade) aggregate rows for /stats, one query per table."""
+        with self.Session() as db:
+            users = db.query(
+                func.count(User.id),
+                func.count(case((User.is_active == True, 1))),
+                func.count(case((User.role == UserRole.ADMIN, 1))),
+                func.count(case((User.role == UserRole.BANNED, 1)))
+            ).one()
+            
+            accounts = db.query(
+                func.count(MT5Account.id),
+                func.count(case((MT5Account.status == AccountStatus.ACTIVE, 1))),
+                func.count(case((MT5Account.auto_trade_enabled == True, 1))),
+                func.count(case((MT5Account.status == AccountStatus.PENDING, 1))),
+                func.count(case((MT5Account.status == AccountStatus.ERROR, 1)))
+            ).one()
+            
+            # P&L summed in SQL
+            trades = db.query(
+                func.count(Trade.id),
+                func.count(case((Trade.is_closed == False, 1))),
+                func.count(case((Trade.is_closed == True, 1))),
+                func.count(case((and_(Trade.is_closed == True, Trade.profit > 0), 1))),
+                func.count(case((and_(Trade.is_closed == True, Trade.profit < 0), 1))),
+                func.coalesce(func.sum(case((Trade.is_closed == True, Trade.profit))), 0.0),
+                func.count(case((Trade.open_time >= today_start, 1)))
+            ).one()
+            
+            return users, accounts, trades
+    
+    def _users_page(self, page: int, limit: int, after_chat_id: Optional[int] = None):
+        """
+        (users, total_users, {user_id: account_count}, page) for one /users page.
+        
+        Pages are ordered newest first by (created_at, id). With
+        after_chat_id (the last user of the previous page) the query seeks
+        straight past that row instead of scanning and discarding OFFSET rows,
+        and the page number is derived from the cursor's position.
+        """
+        counted = aliased(User)
+        
+        with self.Session() as db:
+            anchor = None
+            if after_chat_id is not None:
+                # Users up to and including the cursor in listing order
+                position = select(func.count(counted.id)).where(
+                    tuple_(counted.created_at, counted.id) >= tuple_(User.created_at, User.id)
+                ).scalar_subquery()
+                anchor = db.query(User.created_at, User.id, position).filter_by(
+                    telegram_chat_id=after_chat_id
+                ).first()
+            
+            # The uncorrelated count subquery carries the table total on every
+            # page row, so the page and its total come back in one round-trip
+            total = select(func.count(counted.id)).scalar_subquery()
+            query = db.query(User, total).order_by(
+                User.created_at.desc(), User.id.desc()
+            )
+            if anchor is not None:
+                query = query.filter(
+                    tuple_(User.created_at, User.id) < (anchor.created_at, anchor.id)
+                )
+                page = anchor[2] // limit + 1
+            else:
+                query = query.offset((page - 1) * limit)
+            
+            rows = query.limit(limit).all()
+            
+            if not rows:
+                return [], 0, {}, page
+            
+            users = [user for user, _ in rows]
+            total_users = rows[0][1]
+            
+            # Account counts for the whole page in one grouped query
+            account_counts = dict(
+                db.query(MT5Account.user_id, func.count(MT5Account.id))
+                .filter(MT5Account.user_id.in_([u.id for u in users]))
+                .group_by(MT5Account.user_id)
+                .all()
+            )
+            return users, total_users, account_counts, page
+    
+    def _count_broadcast_recipients(self) -> int:
+        with self.Session() as db:
+            return db.query(func.count(User.id)).filter_by(
+                is_active=True,
+                notifications_enabled=True
+            ).scalar()
+    
+    def _broadcast_chat_ids(self) -> List[int]:
+        # Only the chat_id column, streamed in batches; no User objects
+        with self.Session() as db:
+            return [
+                chat_id for (chat_id,) in db.query(User.telegram_chat_id).filter_by(
+                    is_active=True,
+                    notifications_enabled=True
+                ).yield_per(1000)
+            ]
+    
+    def _ban_user(self, chat_id: int) -> Optional[User]:
+        """
+        Ban a user and disable their accounts.
+        
+        Returns the user (left untouched if they are an admin), or None.
+        """
+        with self.Session() as db:
+            target_user = db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            if target_user is None or target_user.role == UserRole.ADMIN:
+                return target_user
+            
+            target_user.role = UserRole.BANNED
+            target_user.is_active = False
+            
+            # Disable all accounts in a single UPDATE
+            db.query(MT5Account).filter_by(user_id=target_user.id).update(
+                {'auto_trade_enabled': False, 'status': AccountStatus.INACTIVE},
+                synchronize_session=False
+            )
+            
+            db.commit()
+            return target_user
+    
+    def _unban_user(self, chat_id: int) -> Optional[User]:
+        with self.Session() as db:
+            target_user = db.query(User).filter_by(telegram_chat_id=chat_id).first()
+            if target_user is None:
+                return None
+            
+            target_user.role = UserRole.USER
+            target_user.is_active = True
+            db.commit()
+            return target_user
+    
+    async def _get_mt5_status(self) -> Tuple[str, str]:
+        """MT5 status, probed on MT5_EXECUTOR at most once per MT5_STATUS_TTL."""
+        cached = self._mt5_status_cache
+        if cached and monotonic() < cached[2]:
+            return cached[0], cached[1]
+        
+        # Shares the account handlers' single MT5 thread: the terminal session
+        # is global, so a probe must not interleave with an account test
+        status, error = await asyncio.get_running_loop().run_in_executor(
+            MT5_EXECUTOR, self._probe_mt5
+        )
+        self._mt5_status_cache = (status, error, monotonic() + MT5_STATUS_TTL)
+        return status, error
+    
+    async def _get_stats_snapshot(self):
+        """
+        (generated_at, counts) for /stats, recomputed at most once per
+        STATS_SNAPSHOT_TTL or when the UTC day rolls over.
+        """
+        now = datetime.utcnow()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        snapshot = self._stats_snapshot
+        if snapshot and monotonic() < snapshot[2] and snapshot[0] >= today_start:
+            return snapshot[0], snapshot[1]
+        
+        counts = await asyncio.to_thread(self._stats_counts, today_start)
+        self._stats_snapshot = (now, counts, monotonic() + STATS_SNAPSHOT_TTL)
+        return now, counts
     
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
@@ -96,67 +437,29 @@ class AdminCommandHandler:
             return
         
         # Admin check
-        is_admin, user = self._check_admin(chat_id)
+        is_admin, user_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
         
         try:
+            generated_at, (user_counts, account_counts, trade_counts) = await self._get_stats_snapshot()
+            
             # User statistics
-            total_users = self.db.query(User).count()
-            active_users = self.db.query(User).filter_by(is_active=True).count()
-            admin_count = self.db.query(User).filter_by(role=UserRole.ADMIN).count()
-            banned_count = self.db.query(User).filter_by(role=UserRole.BANNED).count()
+            total_users, active_users, admin_count, banned_count = user_counts
             
             # Account statistics
-            total_accounts = self.db.query(MT5Account).count()
-            active_accounts = self.db.query(MT5Account).filter_by(status='active').count()
-            auto_trade_accounts = self.db.query(MT5Account).filter_by(auto_trade_enabled=True).count()
-            pending_accounts = self.db.query(MT5Account).filter_by(status='pending').count()
-            error_accounts = self.db.query(MT5Account).filter_by(status='error').count()
+            (total_accounts, active_accounts, auto_trade_accounts,
+             pending_accounts, error_accounts) = account_counts
             
             # Trading statistics
-            total_trades = self.db.query(Trade).count()
-            open_trades = self.db.query(Trade).filter_by(is_closed=False).count()
-            closed_trades = self.db.query(Trade).filter_by(is_closed=True).count()
-            
-            # Calculate P&L
-            winning_trades = self.db.query(Trade).filter(
-                Trade.is_closed == True,
-                Trade.profit > 0
-            ).count()
-            losing_trades = self.db.query(Trade).filter(
-                Trade.is_closed == True,
-                Trade.profit < 0
-            ).count()
+            (total_trades, open_trades, closed_trades, winning_trades,
+             losing_trades, total_pnl, today_trades) = trade_counts
             
             win_rate = (winning_trades / closed_trades * 100) if closed_trades > 0 else 0
             
-            total_profit = self.db.query(Trade).filter(
-                Trade.is_closed == True
-            ).with_entities(Trade.profit).all()
-            total_pnl = sum([t[0] for t in total_profit if t[0] is not None])
-            
-            # Today's statistics
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_trades = self.db.query(Trade).filter(
-                Trade.open_time >= today_start
-            ).count()
-            
             # System health metrics
-            from src.data.mt5_connector import MT5Connector
-            from config.settings import settings
-            
-            mt5_status = "UNKNOWN"
-            try:
-                connector = MT5Connector(settings)
-                if connector.connect():
-                    mt5_status = "CONNECTED"
-                    connector.disconnect()
-                else:
-                    mt5_status = "DISCONNECTED"
-            except:
-                mt5_status = "ERROR"
+            mt5_status, _ = await self._get_mt5_status()
             
             stats_msg = f"""
 SYSTEM STATISTICS - ADMIN PANEL
@@ -192,12 +495,12 @@ Bot Status: RUNNING
 Database: CONNECTED
 Version: 2.0.0 Production
 
-Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
+Generated: {generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
             """
             
             # Log admin action
             self._log_audit(
-                user_id=user.id,
+                user_id=user_id,
                 action="VIEW_STATS",
                 success=True,
                 details="Admin viewed system statistics"
@@ -207,7 +510,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
             
         except Exception as e:
             self._log_audit(
-                user_id=user.id if user else None,
+                user_id=user_id,
                 action="VIEW_STATS",
                 success=False,
                 details=f"Error: {str(e)}"
@@ -222,7 +525,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
         chat_id = update.effective_chat.id
         
         # Admin check
-        is_admin, user = self._check_admin(chat_id)
+        is_admin, user_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
@@ -233,44 +536,47 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
             if context.args and context.args[0].isdigit():
                 page = int(context.args[0])
             
+            # Optional cursor: chat ID of the last user on the previous page
+            after_chat_id = None
+            if context.args and len(context.args) > 1 and context.args[1].isdigit():
+                after_chat_id = int(context.args[1])
+            
             page_size = 10
-            offset = (page - 1) * page_size
             
             # Get users
-            users = self.db.query(User).order_by(
-                User.created_at.desc()
-            ).offset(offset).limit(page_size).all()
-            
-            total_users = self.db.query(User).count()
+            users, total_users, account_counts, page = await asyncio.to_thread(
+                self._users_page, page, page_size, after_chat_id
+            )
             total_pages = (total_users + page_size - 1) // page_size
             
             if not users:
                 await update.message.reply_text("No users found on this page.")
                 return
             
-            msg = f"REGISTERED USERS (Page {page}/{total_pages})\n\n"
+            parts = [f"REGISTERED USERS (Page {page}/{total_pages})\n\n"]
             
             for u in users:
-                status_icon = '🟢' if u.is_active else '🔴'
-                role_badge = {
-                    UserRole.ADMIN: '[ADMIN]',
-                    UserRole.USER: '[USER]',
-                    UserRole.BANNED: '[BANNED]'
-                }.get(u.role, '[UNKNOWN]')
+                status_icon = self._STATUS_ICON[bool(u.is_active)]
+                role_badge = self._ROLE_BADGE.get(u.role, '[UNKNOWN]')
+                last_active = u.last_active.strftime('%Y-%m-%d %H:%M') if u.last_active else 'Never'
                 
-                msg += f"{status_icon} {role_badge} {u.first_name}\n"
-                msg += f"   Username: @{u.telegram_username or 'N/A'}\n"
-                msg += f"   Chat ID: {u.telegram_chat_id}\n"
-                msg += f"   Accounts: {len(u.accounts)}\n"
-                msg += f"   Registered: {u.created_at.strftime('%Y-%m-%d')}\n"
-                msg += f"   Last Active: {u.last_active.strftime('%Y-%m-%d %H:%M') if u.last_active else 'Never'}\n\n"
+                parts.append(
+                    f"{status_icon} {role_badge} {u.first_name}\n"
+                    f"   Username: @{u.telegram_username or 'N/A'}\n"
+                    f"   Chat ID: {u.telegram_chat_id}\n"
+                    f"   Accounts: {account_counts.get(u.id, 0)}\n"
+                    f"   Registered: {u.created_at.strftime('%Y-%m-%d')}\n"
+                    f"   Last Active: {last_active}\n\n"
+                )
             
-            msg += f"\nTotal Users: {total_users}\n"
-            msg += f"Use /users {page + 1} for next page" if page < total_pages else ""
+            parts.append(f"\nTotal Users: {total_users}\n")
+            if page < total_pages:
+                parts.append(f"Use /users {page + 1} {users[-1].telegram_chat_id} for next page")
+            msg = "".join(parts)
             
             # Log action
             self._log_audit(
-                user_id=user.id,
+                user_id=user_id,
                 action="VIEW_USERS",
                 success=True,
                 details=f"Viewed users page {page}"
@@ -289,7 +595,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
         chat_id = update.effective_chat.id
         
         # Admin check
-        is_admin, admin_user = self._check_admin(chat_id)
+        is_admin, admin_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
@@ -312,10 +618,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
             return
         
         # Get user count
-        active_users = self.db.query(User).filter_by(
-            is_active=True,
-            notifications_enabled=True
-        ).all()
+        recipient_count = await asyncio.to_thread(self._count_broadcast_recipients)
         
         # Confirmation keyboard
         keyboard = [
@@ -328,12 +631,12 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
         
         # Store message in context
         context.user_data['broadcast_message'] = message
-        context.user_data['broadcast_count'] = len(active_users)
+        context.user_data['broadcast_count'] = recipient_count
         
         await update.message.reply_text(
             f"BROADCAST CONFIRMATION\n\n"
             f"Message: {message}\n\n"
-            f"Will be sent to: {len(active_users)} active users\n\n"
+            f"Will be sent to: {recipient_count} active users\n\n"
             f"Are you sure?",
             reply_markup=reply_markup
         )
@@ -346,7 +649,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
         chat_id = update.effective_user.id
         
         # Admin check
-        is_admin, admin_user = self._check_admin(chat_id)
+        is_admin, admin_id = await self._check_admin(chat_id)
         if not is_admin:
             await query.edit_message_text("Admin access required.")
             return
@@ -368,14 +671,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
             )
             
             # Get all active users
-            users = self.db.query(User).filter_by(
-                is_active=True,
-                notifications_enabled=True
-            ).all()
-            
-            # Send broadcast
-            success_count = 0
-            fail_count = 0
+            chat_ids = await asyncio.to_thread(self._broadcast_chat_ids)
             
             broadcast_message = f"""
 [ADMIN BROADCAST]
@@ -383,24 +679,39 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
 {message}
 
 Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
-            """
+            """.strip()
             
-            from telegram import Bot
             bot = context.bot
+            limiter = self._broadcast_limiter
             
-            for user in users:
-                try:
-                    await bot.send_message(
-                        chat_id=user.telegram_chat_id,
-                        text=broadcast_message.strip()
+            async def send_one(target_chat_id: int) -> bool:
+                async with limiter:
+                    try:
+                        await bot.send_message(chat_id=target_chat_id, text=broadcast_message)
+                        return True
+                    except Exception:
+                        return False
+            
+            # Send broadcast concurrently, one bounded chunk at a time
+            success_count = 0
+            fail_count = 0
+            
+            for start in range(0, len(chat_ids), BROADCAST_CHUNK_SIZE):
+                chunk = chat_ids[start:start + BROADCAST_CHUNK_SIZE]
+                results = await asyncio.gather(*(send_one(target) for target in chunk))
+                sent = sum(results)
+                success_count += sent
+                fail_count += len(results) - sent
+                
+                if start + BROADCAST_CHUNK_SIZE < len(chat_ids):
+                    await query.edit_message_text(
+                        f"Broadcasting to {user_count} users...\n"
+                        f"Progress: {success_count + fail_count}/{len(chat_ids)}"
                     )
-                    success_count += 1
-                except Exception as e:
-                    fail_count += 1
             
             # Log broadcast
             self._log_audit(
-                user_id=admin_user.id,
+                user_id=admin_id,
                 action="BROADCAST_MESSAGE",
                 success=True,
                 details=f"Sent to {success_count} users, {fail_count} failed. Message: {message[:100]}"
@@ -421,7 +732,7 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
         chat_id = update.effective_chat.id
         
         # Admin check
-        is_admin, admin_user = self._check_admin(chat_id)
+        is_admin, admin_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
@@ -435,8 +746,8 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
         
         target_chat_id = int(context.args[0])
         
-        # Find user
-        target_user = self.db.query(User).filter_by(telegram_chat_id=target_chat_id).first()
+        # Find and ban user (admins are left untouched)
+        target_user = await asyncio.to_thread(self._ban_user, target_chat_id)
         
         if not target_user:
             await update.message.reply_text(f"User with chat ID {target_chat_id} not found.")
@@ -447,20 +758,12 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
             await update.message.reply_text("Cannot ban admin users.")
             return
         
-        # Ban user
-        target_user.role = UserRole.BANNED
-        target_user.is_active = False
-        
-        # Disable all accounts
-        for account in target_user.accounts:
-            account.auto_trade_enabled = False
-            account.status = 'inactive'
-        
-        self.db.commit()
+        self._admin_cache.pop(target_chat_id, None)
+        self._stats_snapshot = None
         
         # Log action
         self._log_audit(
-            user_id=admin_user.id,
+            user_id=admin_id,
             action="BAN_USER",
             resource_type="user",
             resource_id=target_user.id,
@@ -478,7 +781,7 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
         """Unban a user. Admin only."""
         chat_id = update.effective_chat.id
         
-        is_admin, admin_user = self._check_admin(chat_id)
+        is_admin, admin_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
@@ -488,18 +791,17 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
             return
         
         target_chat_id = int(context.args[0])
-        target_user = self.db.query(User).filter_by(telegram_chat_id=target_chat_id).first()
+        target_user = await asyncio.to_thread(self._unban_user, target_chat_id)
         
         if not target_user:
             await update.message.reply_text(f"User not found.")
             return
         
-        target_user.role = UserRole.USER
-        target_user.is_active = True
-        self.db.commit()
+        self._admin_cache.pop(target_chat_id, None)
+        self._stats_snapshot = None
         
         self._log_audit(
-            user_id=admin_user.id,
+            user_id=admin_id,
             action="UNBAN_USER",
             resource_type="user",
             resource_id=target_user.id,
@@ -512,44 +814,39 @@ Sent: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}
         """Check system health. Admin only."""
         chat_id = update.effective_chat.id
         
-        is_admin, admin_user = self._check_admin(chat_id)
+        is_admin, admin_id = await self._check_admin(chat_id)
         if not is_admin:
             await update.message.reply_text("Admin access required.")
             return
         
-        health_msg = "SYSTEM HEALTH CHECK\n\n"
-        
-        # Database check
-        try:
-            self.db.query(User).first()
-            health_msg += "Database: OK\n"
-        except Exception as e:
-            health_msg += f"Database: ERROR - {str(e)[:50]}\n"
-        
-        # MT5 connection check
-        from src.data.mt5_connector import MT5Connector
-        from config.settings import settings
-        
-        try:
-            connector = MT5Connector(settings)
-            if connector.connect():
-                health_msg += "MT5 Connection: OK\n"
-                connector.disconnect()
-            else:
-                health_msg += "MT5 Connection: FAILED\n"
-        except Exception as e:
-            health_msg += f"MT5 Connection: ERROR - {str(e)[:50]}\n"
+        # Database and MT5 checks run concurrently
+        db_status, (status, error) = await asyncio.gather(
+            asyncio.to_thread(self._ping_db),
+            self._get_mt5_status()
+        )
+        mt5_status = self._MT5_HEALTH_LABEL.get(status) or f"ERROR - {error}"
         
         # Check disk space, memory, etc. (simplified)
-        import psutil
-        health_msg += f"\nMemory Usage: {psutil.virtual_memory().percent}%\n"
-        health_msg += f"CPU Usage: {psutil.cpu_percent()}%\n"
+        memory_percent, cpu_percent = _system_usage()
+        
+        health_msg = (
+            f"SYSTEM HEALTH CHECK\n\n"
+            f"Database: {db_status}\n"
+            f"MT5 Connection: {mt5_status}\n"
+            f"\nMemory Usage: {memory_percent}%\n"
+            f"CPU Usage: {cpu_percent}%\n"
+        )
         
         await update.message.reply_text(health_msg)
 
 
-def register_admin_handlers(application, db_session: Session):
-    """Register all admin command handlers."""
+def register_admin_handlers(application, db_session: Session) -> AdminCommandHandler:
+    """
+    Register all admin command handlers.
+    
+    Returns the handler so the caller can ``await handler.close()`` on
+    shutdown to flush pending audit rows.
+    """
     handler = AdminCommandHandler(db_session)
     
     application.add_handler(CommandHandler('stats', handler.stats_command))
@@ -563,4 +860,6 @@ def register_admin_handlers(application, db_session: Session):
     application.add_handler(CallbackQueryHandler(
         handler.broadcast_callback,
         pattern="^broadcast_"
-    ))
\ No newline at end of file
+    ))
+    
+    return handler
@@ -11,6 +11,7 @@ from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler, Con
 from sqlalchemy.orm import Session
 from src.database.models import User, MT5Account, Trade, AccountStatus
 from src.security.validator import InputValidator
+from src.telegram_bot.handlers.account_commands import invalidate_user
 from datetime import datetime, timedelta
 
 # Conversation states for risk settings
@@ -152,6 +153,7 @@ class MissingCommandHandler:
         # Delete account (CASCADE will delete associated trades)
         self.db.delete(account)
         self.db.commit()
+        invalidate_user(chat_id)
         
         await query.edit_message_text(
             f"ACCOUNT DELETED\n\n"
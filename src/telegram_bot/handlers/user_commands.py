@@ -10,6 +10,7 @@ from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
 from sqlalchemy.orm import Session
 from src.database.models import User, UserRole, MT5Account, Trade
 from src.telegram_bot.keyboards import BotKeyboards
+from src.telegram_bot.handlers.account_commands import invalidate_user
 from src.security.validator import InputValidator
 from datetime import datetime, timedelta
 
@@ -32,7 +33,8 @@ class UserCommandHandler:
             # Validate chat ID
             chat_id = self.validator.validate_telegram_chat_id(chat_id)
             
-            # Get or create user
+            # Get or create user; account handlers re-read it on their next update
+            invalidate_user(chat_id)
             user = self.db.query(User).filter_by(telegram_chat_id=chat_id).first()
             
             if not user:
@@ -42,6 +42,10 @@ class SignalGenerator:
         except:
             self.logger.warning("No pre-trained models found")
     
+    def close(self):
+        """Stop the sentiment analyzer's worker processes."""
+        self.sentiment_analyzer.close()
+    
     def generate_signal(self, symbol: str) -> Optional[Dict]:
         """Generate complete trading signal for a symbol."""
         
@@ -232,6 +236,7 @@ if __name__ == "__main__":
             else:
                 print("  No signal")
         
+        generator.close()
         connector.disconnect()
     
     print("\nSignal Generator test completed!")
\ No newline at end of file
@@ -58,6 +58,54 @@ def test_smc_analyzer():
     assert htf_context is not None
     assert 'trend' in htf_context
 
+def create_trending_data(length=300, seed=7):
+    """Create seeded random-walk OHLC data with varying candle ranges."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2023-01-01', periods=length, freq='1H')
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    spread = rng.uniform(0.1, 2.0, length)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(1000, 2000, length)
+    }, index=dates)
+
+
+def _ob_fields(order_blocks):
+    """Order block fields that must match across scan paths (no timestamp)."""
+    return [
+        (ob.candle_index, ob.price_high, ob.price_low, ob.body_high, ob.body_low,
+         ob.is_unmitigated, ob.distance_to_liquidity, ob.direction)
+        for ob in order_blocks
+    ]
+
+
+@pytest.mark.parametrize("direction", ["bullish", "bearish"])
+def test_order_block_scan_parity(monkeypatch, direction):
+    """Numba, numpy and streaming order block scans agree."""
+    import src.strategy.poi_detector as poi_module
+    
+    df = create_trending_data()
+    
+    monkeypatch.setattr(poi_module, "NUMBA_AVAILABLE", False)
+    numpy_obs = _ob_fields(POIDetector().detect_order_blocks(df, direction=direction))
+    assert numpy_obs
+    
+    # The kernels run as plain Python when Numba is missing, so this path
+    # is checked either way
+    monkeypatch.setattr(poi_module, "NUMBA_AVAILABLE", True)
+    assert _ob_fields(POIDetector().detect_order_blocks(df, direction=direction)) == numpy_obs
+    
+    detector = POIDetector()
+    for length, row in enumerate(df[['open', 'high', 'low', 'close']].to_dict('records'), 1):
+        detector.update(row)
+        if length % 50 == 0 or length == len(df):
+            expected = POIDetector().detect_order_blocks(df.iloc[:length], direction=direction)
+            assert _ob_fields(detector.current_order_blocks(direction)) == _ob_fields(expected)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file